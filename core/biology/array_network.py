@@ -0,0 +1,160 @@
+import numpy as np
+import networkx as nx
+
+
+class ArrayNetwork:
+    def __init__(self, nodes, src, dst, weight):
+        """
+        Compact undirected PPI network stored as COO edge arrays.
+
+        nodes: protein names, position = node id
+        src, dst: int32 node ids per edge
+        weight: interaction confidence per edge (float32 or float64;
+                memory-mapped arrays are used as-is, without copying)
+
+        Exposes nodes() / edges(data=True) / number_of_* like nx.Graph
+        so existing biology code can take either representation.
+        """
+        self.node_names = list(nodes)
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        weight = np.asarray(weight)
+        if not np.issubdtype(weight.dtype, np.floating):
+            weight = weight.astype(np.float64)
+        self.weight = weight
+
+        self._adjacency = None
+
+    # ---------------------------
+    # Construction / conversion
+    # ---------------------------
+    @classmethod
+    def from_string_records(cls, records):
+        """
+        Build from STRING API records (preferredName_A/B, score),
+        using the same node and edge order as PPINetworkBuilder.build_graph.
+        """
+        node_index = {}
+        edge_index = {}
+        src, dst, weight = [], [], []
+
+        for item in records:
+            ids = []
+            for name in (item["preferredName_A"], item["preferredName_B"]):
+                if name not in node_index:
+                    node_index[name] = len(node_index)
+                ids.append(node_index[name])
+
+            u, v = ids
+            key = (u, v) if u <= v else (v, u)
+            if key in edge_index:
+                # Repeated pair overwrites the weight, as nx.Graph.add_edge does
+                weight[edge_index[key]] = item["score"]
+                continue
+
+            edge_index[key] = len(src)
+            src.append(u)
+            dst.append(v)
+            weight.append(item["score"])
+
+        return cls(list(node_index), src, dst, np.asarray(weight, dtype=np.float64))
+
+    @classmethod
+    def from_networkx(cls, graph, weight="weight"):
+        nodes = list(graph.nodes())
+        index = {name: i for i, name in enumerate(nodes)}
+
+        src = np.empty(graph.number_of_edges(), dtype=np.int32)
+        dst = np.empty(graph.number_of_edges(), dtype=np.int32)
+        w = np.empty(graph.number_of_edges(), dtype=np.float64)
+
+        for e, (u, v, data) in enumerate(graph.edges(data=True)):
+            src[e] = index[u]
+            dst[e] = index[v]
+            w[e] = data[weight]
+
+        return cls(nodes, src, dst, w)
+
+    def to_networkx(self):
+        G = nx.Graph()
+        G.add_nodes_from(self.node_names)
+        names = self.node_names
+        G.add_weighted_edges_from(
+            zip(
+                (names[i] for i in self.src.tolist()),
+                (names[i] for i in self.dst.tolist()),
+                self.weight.tolist()
+            )
+        )
+        return G
+
+    # ---------------------------
+    # nx.Graph-compatible views
+    # ---------------------------
+    def nodes(self):
+        return self.node_names
+
+    def edges(self, data=False):
+        names = self.node_names
+        for u, v, w in zip(self.src.tolist(), self.dst.tolist(), self.weight.tolist()):
+            if data:
+                yield names[u], names[v], {"weight": w}
+            else:
+                yield names[u], names[v]
+
+    def number_of_nodes(self):
+        return len(self.node_names)
+
+    def number_of_edges(self):
+        return len(self.src)
+
+    def __len__(self):
+        return len(self.node_names)
+
+    def __contains__(self, name):
+        return name in self.node_index
+
+    # ---------------------------
+    # Array helpers
+    # ---------------------------
+    def adjacency(self):
+        """
+        CSR incidence: for node i, edge_ids[indptr[i]:indptr[i + 1]]
+        are the edges touching i and neighbors[...] the nodes across them.
+        Built once on first use.
+        """
+        if self._adjacency is None:
+            n = self.number_of_nodes()
+            ends = np.concatenate([self.src, self.dst])
+            other = np.concatenate([self.dst, self.src])
+            edge_ids = np.concatenate([np.arange(len(self.src))] * 2).astype(np.int64)
+
+            order = np.argsort(ends, kind="stable")
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(ends, minlength=n), out=indptr[1:])
+
+            self._adjacency = (indptr, other[order], edge_ids[order])
+        return self._adjacency
+
+    def neighbors(self, name):
+        indptr, neighbors, _ = self.adjacency()
+        i = self.node_index[name]
+        return [self.node_names[j] for j in neighbors[indptr[i]:indptr[i + 1]].tolist()]
+
+    def state_array(self, state, default=1.0):
+        """
+        Align a {protein: value} state dict with the node order.
+        """
+        return np.array(
+            [state.get(name, default) for name in self.node_names],
+            dtype=np.float64
+        )
+
+    def state_dict(self, values):
+        return dict(zip(self.node_names, np.asarray(values).tolist()))
+
+    @property
+    def nbytes(self):
+        return self.src.nbytes + self.dst.nbytes + self.weight.nbytes
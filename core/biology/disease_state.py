@@ -1,35 +1,189 @@
+import hashlib
+import importlib.util
+import json
+import os
+
 import pandas as pd
 import numpy as np
 
+from core.profiling import profiled
+
+# Expression cache formats; the pandas columnar ones need pyarrow
+CACHE_FORMATS = (".npz", ".parquet", ".feather")
+ARROW_FORMATS = (".parquet", ".feather")
+
 class DiseaseStateModel:
     def __init__(self, fold_change_col="logFC"):
         self.fold_change_col = fold_change_col
 
-    def load_expression_data(self, csv_path):
+    @profiled
+    def load_expression_data(self, csv_path, columns=None, genes=None,
+                             chunksize=None, cache_path=None):
         """
         CSV should contain:
         - 'gene' column
         - fold change column (default: logFC)
+
+        Only 'gene' and the fold change column(s) are parsed, with
+        explicit dtypes.
+
+        columns: fold change columns to read (default: [fold_change_col])
+        genes: keep only these genes (e.g. graph.nodes()); with chunksize
+               set, peak memory scales with this set, not the file
+        chunksize: rows per chunk when streaming large files
+        cache_path: .npz, .parquet or .feather artifact written after the
+                    first load and reused while the CSV and the
+                    columns/genes selection are unchanged
+                    (.parquet / .feather need the optional pyarrow)
         """
-        return pd.read_csv(csv_path)
+        columns = list(columns or [self.fold_change_col])
+        wanted = None if genes is None else set(genes)
+
+        meta = None
+        if cache_path is not None:
+            self._check_cache_format(cache_path)
+            meta = self._cache_meta(csv_path, columns, wanted)
+            cached = self._read_cache(cache_path, meta)
+            if cached is not None:
+                return cached
+
+        reader = pd.read_csv(
+            csv_path,
+            usecols=["gene"] + columns,
+            dtype={"gene": str, **{col: np.float64 for col in columns}},
+            chunksize=chunksize
+        )
+        chunks = [reader] if chunksize is None else reader
+
+        parts = []
+        for chunk in chunks:
+            if wanted is not None:
+                chunk = chunk[chunk["gene"].isin(wanted)]
+            parts.append(chunk)
 
-    def build_state_vector(self, graph, expression_df):
+        df = pd.concat(parts, ignore_index=True)[["gene"] + columns]
+
+        if cache_path is not None:
+            self._write_cache(cache_path, df, meta)
+
+        return df
+
+    @staticmethod
+    def _check_cache_format(cache_path):
+        """
+        Fail before parsing the CSV, not after, on an unusable cache path.
         """
+        if not cache_path.endswith(CACHE_FORMATS):
+            raise ValueError(
+                f"Unsupported cache format: {cache_path} "
+                f"(expected one of {', '.join(CACHE_FORMATS)})"
+            )
+        if cache_path.endswith(ARROW_FORMATS) and importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(
+                f"{os.path.splitext(cache_path)[1]} expression caches need pyarrow "
+                "(pip install pyarrow), or use a .npz cache_path"
+            )
+
+    @staticmethod
+    def _cache_meta(csv_path, columns, wanted):
+        stat = os.stat(csv_path)
+        genes_hash = None
+        if wanted is not None:
+            genes_hash = hashlib.sha256(
+                "\n".join(sorted(wanted)).encode("utf-8")
+            ).hexdigest()
+
+        return {
+            "source": os.path.abspath(csv_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "columns": columns,
+            "genes": genes_hash
+        }
+
+    @staticmethod
+    def _read_cache(cache_path, meta):
+        try:
+            with open(f"{cache_path}.meta.json", "r", encoding="utf-8") as fh:
+                if json.load(fh) != meta:
+                    return None
+        except (OSError, ValueError):
+            return None
+
+        if cache_path.endswith(".npz"):
+            with np.load(cache_path, allow_pickle=False) as data:
+                return pd.DataFrame(
+                    {col: data[col] for col in ["gene"] + meta["columns"]}
+                )
+        if cache_path.endswith(".parquet"):
+            return pd.read_parquet(cache_path)
+        return pd.read_feather(cache_path)
+
+    @staticmethod
+    def _write_cache(cache_path, df, meta):
+        if cache_path.endswith(".npz"):
+            np.savez(
+                cache_path,
+                gene=df["gene"].to_numpy(dtype=str),
+                **{col: df[col].to_numpy() for col in meta["columns"]}
+            )
+        elif cache_path.endswith(".parquet"):
+            df.to_parquet(cache_path, index=False)
+        else:
+            df.to_feather(cache_path)
+
+        with open(f"{cache_path}.meta.json", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+
+    @profiled
+    def build_state_vector(self, graph, expression_df, as_arrays=False):
+        """
+        graph: nx.Graph or ArrayNetwork
+        as_arrays: return NumPy vectors aligned with graph.nodes() order
+                   instead of dicts
+
         Returns:
         - healthy_state: dict {protein: 1.0}
         - disease_state: dict {protein: weighted by expression}
         """
-        healthy_state = {}
-        disease_state = {}
+        nodes = list(graph.nodes())
+        healthy, disease = self.build_state_matrix(
+            graph, expression_df, [self.fold_change_col]
+        )
+        disease = disease[0]
 
-        for node in graph.nodes():
-            healthy_state[node] = 1.0
+        if as_arrays:
+            return healthy, disease
 
-            match = expression_df[expression_df["gene"] == node]
-            if not match.empty:
-                fc = match[self.fold_change_col].values[0]
-                disease_state[node] = float(np.exp(fc))  # log fold-change → linear
-            else:
-                disease_state[node] = 1.0  # unknown = neutral
+        healthy_state = dict(zip(nodes, healthy.tolist()))
+        disease_state = dict(zip(nodes, disease.tolist()))
 
         return healthy_state, disease_state
+
+    def build_state_matrix(self, graph, expression_df, fold_change_cols):
+        """
+        One disease state per cohort / contrast, in a single pass.
+
+        fold_change_cols: one column per cohort or contrast
+
+        Returns:
+        - healthy: (n_nodes,) vector of 1.0
+        - disease: (n_cohorts × n_nodes) matrix, rows in fold_change_cols
+                   order, columns in graph.nodes() order
+        """
+        nodes = list(graph.nodes())
+        fold_change_cols = list(fold_change_cols)
+        unique = expression_df.drop_duplicates("gene", keep="first")
+
+        # One hash lookup per node instead of a DataFrame scan per node
+        positions = pd.Index(unique["gene"]).get_indexer(nodes)
+        found = positions >= 0
+
+        healthy = np.ones(len(nodes), dtype=np.float64)
+        # unknown = neutral
+        disease = np.ones((len(fold_change_cols), len(nodes)), dtype=np.float64)
+
+        fc = unique[fold_change_cols].to_numpy(dtype=np.float64)[positions[found]]
+        disease[:, found] = np.exp(fc).T  # log fold-change → linear
+
+        return healthy, disease
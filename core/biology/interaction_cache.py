@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qbio", "string")
+
+
+class InteractionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=7 * 24 * 3600,
+                 max_entries=512, max_bytes=None):
+        """
+        On-disk, content-addressed store for STRING interaction responses.
+
+        cache_dir: directory holding one JSON file per query
+        ttl: seconds before an entry counts as stale (None = never)
+        max_entries / max_bytes: size bounds, least recently used
+        entries are evicted first
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(species, score_threshold, proteins):
+        """
+        Hash of (species, required score, sorted protein set), so the
+        same query in any protein order hits the same entry.
+        """
+        payload = json.dumps(
+            [int(species), int(round(score_threshold * 1000)), sorted(set(proteins))],
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key, allow_expired=False):
+        """
+        Returns the cached interaction list, or None on a miss.
+        Stale entries are only returned when allow_expired=True
+        (used by offline mode).
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        expired = self.ttl is not None and time.time() - entry["created"] > self.ttl
+        if expired and not allow_expired:
+            return None
+
+        # Access time drives LRU eviction; creation time drives TTL
+        os.utime(path, None)
+        return entry["data"]
+
+    def put(self, key, data):
+        entry = {"created": time.time(), "data": data}
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Drop least recently used entries until the entry-count and byte
+        bounds are satisfied. Expired entries are kept: offline mode
+        still serves them (get(..., allow_expired=True)).
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and total > self.max_bytes)
+        ):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+
+    def purge_expired(self):
+        """
+        Delete every entry older than the TTL. Never called implicitly;
+        run it only where the offline fallback is not needed.
+
+        Returns: number of entries removed
+        """
+        if self.ttl is None:
+            return 0
+
+        now = time.time()
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    created = json.load(fh)["created"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if now - created > self.ttl:
+                self._remove(path)
+                removed += 1
+        return removed
+
+    def _entries(self):
+        """
+        (mtime, size, path) of every cache file.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
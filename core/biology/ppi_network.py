@@ -1,39 +1,217 @@
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import networkx as nx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.biology.array_network import ArrayNetwork
+from core.profiling import profiled
 
 STRING_API_URL = "https://string-db.org/api/json/network"
+STRING_PARTNERS_URL = "https://string-db.org/api/json/interaction_partners"
+STRING_IDS_URL = "https://string-db.org/api/json/get_string_ids"
 
 class PPINetworkBuilder:
-    def __init__(self, species=9606, score_threshold=0.4):
+    def __init__(self, species=9606, score_threshold=0.4, cache=None,
+                 offline=False, local_dump=None, chunk_size=None,
+                 max_workers=8, retries=3, backoff=0.5):
         """
         species: NCBI species ID (9606 = Homo sapiens)
         score_threshold: Minimum interaction confidence (0–1)
+        cache: optional InteractionCache for STRING responses
+        offline: never touch the network; use the cache or local_dump
+        local_dump: JSON file of STRING network records used offline
+        chunk_size: max identifiers per STRING request; larger protein
+                    sets are fetched in ceil(n / chunk_size) concurrent
+                    batches (None = one request)
+        max_workers: concurrent requests / pooled connections
+        retries / backoff: retry policy for failed or throttled requests
         """
         self.species = species
         self.score_threshold = score_threshold
+        self.cache = cache
+        self.offline = offline
+        self.local_dump = local_dump
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
 
+    @profiled
     def fetch_interactions(self, proteins):
-        params = {
-            "identifiers": "%0d".join(proteins),
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(self.species, self.score_threshold, proteins)
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+
+        if self.offline:
+            return self._fetch_offline(proteins, key)
+
+        if self.chunk_size is not None and len(proteins) > self.chunk_size:
+            data = self.fetch_interactions_batched(proteins)
+        else:
+            data = self._request_chunk(proteins)
+
+        if self.cache is not None:
+            self.cache.put(key, data)
+
+        return data
+
+    def fetch_interactions_batched(self, proteins):
+        """
+        Map proteins to STRING ids, then ask STRING for all interaction
+        partners of each chunk of chunk_size ids (no per-protein limit),
+        keeping partners inside the mapped set. Edges crossing chunk
+        boundaries come back from both chunks, so n proteins cost
+        2 · ceil(n / chunk_size) requests, not one per pair of chunks.
+        Requests run concurrently over one pooled session; edges are
+        merged and deduplicated.
+        """
+        proteins = list(dict.fromkeys(proteins))
+        size = max(1, self.chunk_size)
+
+        # Created here, not lazily in the workers, so they share one pool
+        session = self._get_session()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            mapped = pool.map(
+                lambda chunk: self._string_ids(chunk, session), _chunks(proteins, size)
+            )
+            string_ids = list(dict.fromkeys(itertools.chain.from_iterable(mapped)))
+
+            wanted = set(string_ids)
+            responses = pool.map(
+                lambda chunk: self._request_chunk(chunk, STRING_PARTNERS_URL, session),
+                _chunks(string_ids, size)
+            )
+            records = [
+                item for item in itertools.chain.from_iterable(responses)
+                if item["stringId_A"] in wanted and item["stringId_B"] in wanted
+            ]
+
+        return merge_interactions(records)
+
+    def _get_session(self):
+        if self._session is None:
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"})
+            )
+            adapter = HTTPAdapter(
+                pool_connections=self.max_workers,
+                pool_maxsize=self.max_workers,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _request_chunk(self, proteins, url=STRING_API_URL, session=None):
+        return self._get(url, {
+            "identifiers": "\r".join(proteins),
             "species": self.species,
             "required_score": int(self.score_threshold * 1000)
-        }
+        }, session)
 
-        response = requests.get(STRING_API_URL, params=params)
+    def _string_ids(self, proteins, session=None):
+        """
+        Best-matching STRING id of each identifier (aliases, UniProt and
+        Ensembl ids included); unknown identifiers are dropped.
+        """
+        records = self._get(STRING_IDS_URL, {
+            "identifiers": "\r".join(proteins),
+            "species": self.species,
+            "limit": 1
+        }, session)
+        return [item["stringId"] for item in records]
+
+    def _get(self, url, params, session=None):
+        response = (session or self._get_session()).get(url, params=params)
         response.raise_for_status()
         return response.json()
 
+    def _fetch_offline(self, proteins, key):
+        if self.cache is not None:
+            data = self.cache.get(key, allow_expired=True)
+            if data is not None:
+                return data
+
+        if self.local_dump is None:
+            raise RuntimeError(
+                "Offline mode: no cached interactions for this protein set "
+                "and no local_dump configured"
+            )
+
+        with open(self.local_dump, "r", encoding="utf-8") as fh:
+            records = json.load(fh)
+
+        wanted = set(proteins)
+        return [
+            item for item in records
+            if item["preferredName_A"] in wanted
+            and item["preferredName_B"] in wanted
+            and item["score"] >= self.score_threshold
+        ]
+
+    @profiled
     def build_graph(self, proteins):
-        data = self.fetch_interactions(proteins)
-        G = nx.Graph()
+        return interaction_graph(self.fetch_interactions(proteins))
+
+    @profiled
+    def build_network(self, proteins):
+        """
+        Same interactions as build_graph, as an array-backed ArrayNetwork.
+        """
+        data = merge_interactions(self.fetch_interactions(proteins))
+        return ArrayNetwork.from_string_records(data)
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def merge_interactions(records):
+    """
+    Deduplicate STRING records across overlapping queries.
+    A↔B and B↔A count as the same edge; the highest score wins.
+    """
+    merged = {}
+
+    for item in records:
+        a = item["preferredName_A"]
+        b = item["preferredName_B"]
+        key = (a, b) if a <= b else (b, a)
+
+        current = merged.get(key)
+        if current is None or item["score"] > current["score"]:
+            merged[key] = item
+
+    return list(merged.values())
+
+
+def interaction_graph(records):
+    """
+    nx.Graph of deduplicated STRING records, weighted by score.
+    """
+    G = nx.Graph()
 
-        for item in data:
-            p1 = item["preferredName_A"]
-            p2 = item["preferredName_B"]
-            score = item["score"]
+    for item in merge_interactions(records):
+        p1 = item["preferredName_A"]
+        p2 = item["preferredName_B"]
+        score = item["score"]
 
-            G.add_node(p1)
-            G.add_node(p2)
-            G.add_edge(p1, p2, weight=score)
+        G.add_node(p1)
+        G.add_node(p2)
+        G.add_edge(p1, p2, weight=score)
 
-        return G
+    return G
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from core.biology.array_network import ArrayNetwork
+from core.profiling import profiled
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+class StringDumpLoader:
+    def __init__(self, links_path, info_path=None, score_threshold=0.4,
+                 cache_dir=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Bulk loader for STRING protein.links dumps (plain text or .gz).
+
+        links_path: protein.links file ("protein1 protein2 combined_score")
+        info_path: optional protein.info file mapping STRING ids to
+                   preferred names (so nodes match the API's names)
+        score_threshold: Minimum interaction confidence (0–1)
+        cache_dir: where binary edge lists are persisted; defaults to
+                   "<links_path>.edges/"
+        chunksize: rows parsed per chunk while streaming the dump
+        """
+        self.links_path = links_path
+        self.info_path = info_path
+        self.score_threshold = score_threshold
+        self.cache_dir = cache_dir or f"{links_path}.edges"
+        self.chunksize = chunksize
+
+    @profiled
+    def load(self, proteins=None):
+        """
+        Returns (nodes, src, dst, weight):
+        - nodes: list of protein names, position = node id
+        - src, dst: int32 node ids (memory-mapped when cached)
+        - weight: float32 confidence scores
+
+        The first call streams the dump and writes the binary cache;
+        later calls with the same inputs only mmap the arrays.
+        """
+        path = os.path.join(self.cache_dir, self._cache_key(proteins))
+
+        if not os.path.exists(os.path.join(path, "nodes.json")):
+            self._write(path, *self._parse(proteins))
+
+        return self._open(path)
+
+    def build_graph(self, proteins=None):
+        nodes, src, dst, weight = self.load(proteins)
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        G.add_weighted_edges_from(
+            zip(
+                (nodes[i] for i in src.tolist()),
+                (nodes[i] for i in dst.tolist()),
+                weight.tolist()
+            )
+        )
+        return G
+
+    def load_network(self, proteins=None):
+        """
+        Returns an ArrayNetwork backed by the memory-mapped edge arrays.
+        """
+        return ArrayNetwork(*self.load(proteins))
+
+    def _cache_key(self, proteins):
+        sources = []
+        for p in (self.links_path, self.info_path):
+            if p is None:
+                sources.append(None)
+            else:
+                stat = os.stat(p)
+                sources.append([os.path.abspath(p), stat.st_size, stat.st_mtime_ns])
+
+        payload = json.dumps(
+            [
+                sources,
+                int(round(self.score_threshold * 1000)),
+                None if proteins is None else sorted(set(proteins))
+            ],
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _load_aliases(self):
+        if self.info_path is None:
+            return None
+
+        info = pd.read_csv(
+            self.info_path,
+            sep="\t",
+            usecols=[0, 1],
+            header=0,
+            names=["string_id", "preferred_name"],
+            dtype=str
+        )
+        return dict(zip(info["string_id"], info["preferred_name"]))
+
+    def _parse(self, proteins):
+        aliases = self._load_aliases()
+        wanted = None if proteins is None else set(proteins)
+        min_score = int(round(self.score_threshold * 1000))
+
+        node_index = {}
+        src_parts, dst_parts, score_parts = [], [], []
+
+        reader = pd.read_csv(
+            self.links_path,
+            sep=" ",
+            usecols=["protein1", "protein2", "combined_score"],
+            dtype={"protein1": str, "protein2": str, "combined_score": np.int32},
+            chunksize=self.chunksize
+        )
+
+        for chunk in reader:
+            chunk = chunk[chunk["combined_score"] >= min_score]
+
+            a = chunk["protein1"]
+            b = chunk["protein2"]
+            if aliases is not None:
+                a = a.map(aliases).fillna(a)
+                b = b.map(aliases).fillna(b)
+
+            if wanted is not None:
+                keep = (a.isin(wanted) & b.isin(wanted)).to_numpy()
+                a, b = a[keep], b[keep]
+                chunk = chunk[keep]
+
+            if chunk.empty:
+                continue
+
+            for name in pd.unique(pd.concat([a, b], ignore_index=True)):
+                if name not in node_index:
+                    node_index[name] = len(node_index)
+
+            src_parts.append(a.map(node_index).to_numpy(dtype=np.int32))
+            dst_parts.append(b.map(node_index).to_numpy(dtype=np.int32))
+            score_parts.append(chunk["combined_score"].to_numpy(dtype=np.int32))
+
+        if src_parts:
+            src = np.concatenate(src_parts)
+            dst = np.concatenate(dst_parts)
+            score = np.concatenate(score_parts)
+        else:
+            src = dst = score = np.empty(0, dtype=np.int32)
+
+        # STRING lists every interaction in both directions; keep one
+        # undirected edge per pair with its highest score
+        lo = np.minimum(src, dst).astype(np.int64)
+        hi = np.maximum(src, dst).astype(np.int64)
+        order = np.lexsort((-score, hi, lo))
+        lo, hi, score = lo[order], hi[order], score[order]
+        first = np.ones(len(lo), dtype=bool)
+        first[1:] = (lo[1:] != lo[:-1]) | (hi[1:] != hi[:-1])
+
+        return (
+            list(node_index),
+            lo[first].astype(np.int32),
+            hi[first].astype(np.int32),
+            (score[first] / 1000.0).astype(np.float32)
+        )
+
+    @staticmethod
+    def _write(path, nodes, src, dst, weight):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+
+        np.save(os.path.join(tmp_path, "src.npy"), src)
+        np.save(os.path.join(tmp_path, "dst.npy"), dst)
+        np.save(os.path.join(tmp_path, "weight.npy"), weight)
+        with open(os.path.join(tmp_path, "nodes.json"), "w", encoding="utf-8") as fh:
+            json.dump(nodes, fh)
+
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another process published the same edge list first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @staticmethod
+    def _open(path):
+        with open(os.path.join(path, "nodes.json"), "r", encoding="utf-8") as fh:
+            nodes = json.load(fh)
+
+        src = np.load(os.path.join(path, "src.npy"), mmap_mode="r")
+        dst = np.load(os.path.join(path, "dst.npy"), mmap_mode="r")
+        weight = np.load(os.path.join(path, "weight.npy"), mmap_mode="r")
+
+        return nodes, src, dst, weight
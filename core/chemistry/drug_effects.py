@@ -1,3 +1,6 @@
+from core.profiling import profiled
+
+
 class DrugModel:
     def __init__(self, name, targets):
         """
@@ -9,6 +12,7 @@ class DrugModel:
         self.name = name
         self.targets = targets
 
+    @profiled
     def apply(self, disease_state):
         post_state = disease_state.copy()
 
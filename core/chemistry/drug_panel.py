@@ -0,0 +1,128 @@
+import numpy as np
+from scipy import sparse
+
+from core.profiling import profiled
+
+
+class DrugPanel:
+    def __init__(self, drugs, node_names):
+        """
+        Compiles DrugModel.targets into a sparse (n_drugs × n_nodes)
+        effect matrix aligned with the network's node order.
+
+        drugs: list of DrugModel
+        node_names: node order of the states (graph.nodes() /
+                    ArrayNetwork.node_names); targets outside it are
+                    ignored, as in DrugModel.apply
+        """
+        self.drugs = list(drugs)
+        self.drug_names = [drug.name for drug in self.drugs]
+        self.drug_index = {name: i for i, name in enumerate(self.drug_names)}
+        self.node_names = list(node_names)
+
+        node_index = {name: i for i, name in enumerate(self.node_names)}
+        rows, cols, vals = [], [], []
+
+        for i, drug in enumerate(self.drugs):
+            for protein, effect in drug.targets.items():
+                if protein in node_index:
+                    rows.append(i)
+                    cols.append(node_index[protein])
+                    vals.append(effect)
+
+        # Entries are multipliers; missing entries mean "untouched" (1.0)
+        self.effects = sparse.csr_matrix(
+            (np.asarray(vals, dtype=np.float64), (rows, cols)),
+            shape=(len(self.drugs), len(self.node_names))
+        )
+
+    def __len__(self):
+        return len(self.drugs)
+
+    def effect_matrix(self, drug_ids=None):
+        """
+        Dense multipliers, (n_drugs × n_nodes) with 1.0 off-target.
+        """
+        return self.combination_effects(self._singletons(drug_ids))
+
+    @profiled
+    def apply(self, state, drug_ids=None):
+        """
+        Every drug (or the drug_ids subset) applied to a state in one
+        vectorized scatter, no per-drug dict copies.
+
+        state: (n_nodes,) vector or (n_states × n_nodes) matrix
+        Returns: (n_drugs × n_nodes) or (n_drugs × n_states × n_nodes)
+        """
+        return self.apply_combinations(state, self._singletons(drug_ids))
+
+    def combination_effects(self, combinations):
+        """
+        Product of effects for each drug subset.
+
+        combinations: iterable of drug index (or name) tuples
+        Returns: (n_combinations × n_nodes) multipliers
+        """
+        combo_ids, cols, vals, n = self._expand(combinations)
+        out = np.ones((n, len(self.node_names)), dtype=np.float64)
+        np.multiply.at(out, (combo_ids, cols), vals)
+        return out
+
+    @profiled
+    def apply_combinations(self, state, combinations):
+        """
+        Apply each drug subset to a state, drugs in the given order,
+        matching repeated DrugModel.apply calls value for value.
+
+        state: (n_nodes,) vector or (n_states × n_nodes) matrix
+        Returns: (n_combinations × n_nodes) or
+                 (n_combinations × n_states × n_nodes)
+        """
+        state = np.asarray(state, dtype=np.float64)
+        combo_ids, cols, vals, n = self._expand(combinations)
+
+        out = np.repeat(state[None, ...], n, axis=0)
+        if state.ndim == 1:
+            np.multiply.at(out, (combo_ids, cols), vals)
+        else:
+            # View as (n_combinations × n_nodes × n_states) so one index
+            # pair scales a target across every state
+            np.multiply.at(out.transpose(0, 2, 1), (combo_ids, cols), vals[:, None])
+        return out
+
+    def _singletons(self, drug_ids):
+        if drug_ids is None:
+            drug_ids = range(len(self.drugs))
+        return [(i,) for i in drug_ids]
+
+    def _expand(self, combinations):
+        """
+        Flatten subsets into (combination id, node id, effect) triples
+        gathered from the CSR rows of the member drugs.
+        """
+        combo_ids, drug_ids = [], []
+        n = 0
+        for c, combo in enumerate(combinations):
+            for drug in combo:
+                combo_ids.append(c)
+                drug_ids.append(self.drug_index[drug] if isinstance(drug, str) else drug)
+            n = c + 1
+
+        combo_ids = np.asarray(combo_ids, dtype=np.int64)
+        drug_ids = np.asarray(drug_ids, dtype=np.int64)
+
+        indptr = self.effects.indptr
+        starts = indptr[drug_ids]
+        lengths = indptr[drug_ids + 1] - starts
+        total = int(lengths.sum())
+
+        # Concatenated ranges [starts[i], starts[i] + lengths[i])
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - offsets, lengths) + np.arange(total)
+
+        return (
+            np.repeat(combo_ids, lengths),
+            self.effects.indices[positions],
+            self.effects.data[positions],
+            n
+        )
@@ -1,16 +1,75 @@
+import hashlib
+import json
+
 import numpy as np
-from scipy.stats import beta
+from scipy.special import betaincinv
+
+from core.profiling import profiled
+
+# Leading spawn_key word of for_key() children ("qbk0" in ASCII)
+FOR_KEY_TAG = 0x71626B30
 
 class BayesianSuccessModel:
-    def __init__(self, prior_success=2, prior_failure=2):
+    def __init__(self, prior_success=2, prior_failure=2, seed=None):
         """
         prior_success / prior_failure:
         Low values = weak prior
         High values = strong belief before seeing data
+
+        seed: int, np.random.SeedSequence or np.random.Generator driving
+              the evidence noise (None = fresh OS entropy). A fixed seed
+              makes update() bit-reproducible; use spawn() / for_key()
+              to hand independent streams to workers or combinations.
         """
         self.prior_success = prior_success
         self.prior_failure = prior_failure
 
+        if isinstance(seed, np.random.Generator):
+            self.rng = seed
+            self.seed_sequence = seed.bit_generator.seed_seq
+        else:
+            if not isinstance(seed, np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+            self.seed_sequence = seed
+            self.rng = np.random.default_rng(seed)
+
+    def spawn(self, n):
+        """
+        n child models with independent, reproducible noise streams
+        (e.g. one per worker process).
+        """
+        return [
+            BayesianSuccessModel(self.prior_success, self.prior_failure, child)
+            for child in self.seed_sequence.spawn(n)
+        ]
+
+    def for_key(self, *key):
+        """
+        Child model whose stream depends only on this model's seed and
+        key (ints or strings, e.g. the drug names of a combination), not
+        on scheduling order, so results can be memoized across runs.
+
+        The key is hashed with a "for_key" marker and appended after
+        FOR_KEY_TAG, so keyed streams never coincide with spawn()
+        children (whose spawn_key gains one bare index) and 1 != "1".
+        """
+        parts = [
+            ["int", int(part)] if isinstance(part, (int, np.integer)) else ["str", str(part)]
+            for part in key
+        ]
+        digest = hashlib.sha256(
+            json.dumps(["for_key", parts], separators=(",", ":")).encode("utf-8")
+        ).digest()
+        words = np.frombuffer(digest, dtype="<u4").tolist()
+
+        child = np.random.SeedSequence(
+            self.seed_sequence.entropy,
+            spawn_key=tuple(self.seed_sequence.spawn_key) + (FOR_KEY_TAG,) + tuple(words),
+            pool_size=self.seed_sequence.pool_size
+        )
+        return BayesianSuccessModel(self.prior_success, self.prior_failure, child)
+
+    @profiled
     def update(self, recovery_score, trials=20, noise=0.1):
         """
         Convert recovery score into probabilistic evidence.
@@ -18,7 +77,7 @@ class BayesianSuccessModel:
         trials: virtual experiments
         noise: uncertainty in mapping score → success
         """
-        score = np.clip(recovery_score + np.random.normal(0, noise), 0, 1)
+        score = np.clip(recovery_score + self.rng.normal(0, noise), 0, 1)
 
         successes = int(round(score * trials))
         failures = trials - successes
@@ -28,13 +87,53 @@ class BayesianSuccessModel:
 
         return alpha, beta_param
 
+    @profiled
+    def update_batch(self, recovery_scores, trials=20, noise=0.1):
+        """
+        Vectorized update for an array of recovery scores.
+
+        Returns: (alpha, beta_param) integer arrays shaped like
+        recovery_scores
+        """
+        scores = np.asarray(recovery_scores, dtype=np.float64)
+        score = np.clip(scores + self.rng.normal(0, noise, size=scores.shape), 0, 1)
+
+        # np.rint rounds half to even, like round() in update
+        successes = np.rint(score * trials).astype(np.int64)
+        failures = trials - successes
+
+        alpha = self.prior_success + successes
+        beta_param = self.prior_failure + failures
+
+        return alpha, beta_param
+
+    @profiled
     def probability(self, alpha, beta_param, samples=10000):
-        dist = beta(alpha, beta_param)
-        mean = dist.mean()
-        ci = dist.interval(0.95)
+        """
+        samples: unused; mean and 95% CI are computed in closed form
+        """
+        prob = self.probability_batch(alpha, beta_param)
+
+        return {
+            "mean": float(prob["mean"]),
+            "ci_low": float(prob["ci_low"]),
+            "ci_high": float(prob["ci_high"])
+        }
+
+    @profiled
+    def probability_batch(self, alpha, beta_param, level=0.95):
+        """
+        Posterior mean and equal-tailed credible interval for arrays of
+        Beta parameters, without building a scipy distribution per item.
+
+        Returns: dict of arrays "mean", "ci_low", "ci_high"
+        """
+        alpha = np.asarray(alpha, dtype=np.float64)
+        beta_param = np.asarray(beta_param, dtype=np.float64)
+        tail = (1 - level) / 2
 
         return {
-            "mean": float(mean),
-            "ci_low": float(ci[0]),
-            "ci_high": float(ci[1])
+            "mean": alpha / (alpha + beta_param),
+            "ci_low": betaincinv(alpha, beta_param, tail),
+            "ci_high": betaincinv(alpha, beta_param, 1 - tail)
         }
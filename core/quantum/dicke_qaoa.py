@@ -0,0 +1,208 @@
+import itertools
+from math import comb
+
+import numpy as np
+
+from core.quantum.selection import SubsetResult
+
+
+def subset_states(n, k):
+    """
+    All k-subsets of range(n) in lexicographic order, as a (C(n, k) × k)
+    array of sorted indices.
+    """
+    count = comb(n, k)
+    flat = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(n), k)),
+        dtype=np.int64, count=count * k,
+    )
+    return flat.reshape(count, k)
+
+
+def colex_rank(states):
+    """
+    Combinatorial number system rank of each sorted row:
+        rank = sum(C(c_t, t + 1)) for c_0 < c_1 < ... < c_{k-1}
+    A bijection from k-subsets of range(n) onto 0..C(n, k) - 1.
+    """
+    n = int(states.max()) + 1 if states.size else 0
+    k = states.shape[1]
+    binom = np.array(
+        [[comb(c, t + 1) for t in range(k)] for c in range(n)], dtype=np.int64
+    ).reshape(n, k)
+    return binom[states, np.arange(k)].sum(axis=1)
+
+
+class DickeQAOA:
+    """
+    QAOA with an XY ring mixer, simulated only on the C(n, k) states
+    with exactly k drugs selected (the Dicke subspace).
+
+    The XY mixer swaps |01> <-> |10> on neighbouring qubits, so it never
+    leaves the subspace and pick_k needs no penalty or slack qubits;
+    the start state is the uniform superposition over all k-subsets.
+    n = 40, k = 4 is 91,390 amplitudes instead of 2^40.
+
+    recovery: (n,) scores
+    synergy: (n × n) symmetric matrix (diagonal ignored)
+    k: number of drugs to pick
+
+    Each layer applies
+        phase:  psi *= exp(i · gamma · value)
+        mixer:  exp(-i · beta · (XX + YY) / 2) on ring edges
+                (0, 1), (1, 2), ..., (n - 1, 0), one edge after another
+    where value(S) = sum(recovery[S]) + sum(synergy[i][j], i < j in S).
+    """
+
+    def __init__(self, recovery, synergy, k):
+        recovery = np.asarray(recovery, dtype=np.float64)
+        synergy = np.array(synergy, dtype=np.float64)
+        np.fill_diagonal(synergy, 0.0)
+        n = len(recovery)
+
+        if not 0 < k < n:
+            raise ValueError(f"k must be in 1..{n - 1}, got {k}")
+
+        self.n = n
+        self.k = k
+        self.states = subset_states(n, k)
+
+        # Objective of every basis state
+        self.values = recovery[self.states].sum(axis=1)
+        for a, b in itertools.combinations(range(k), 2):
+            self.values += synergy[self.states[:, a], self.states[:, b]]
+
+        self.best_value = float(self.values.max())
+        self.edges = self._ring_edges()
+
+    def _ring_edges(self):
+        """
+        For each ring edge (i, j): index pairs (states with i but not j,
+        the same states with i replaced by j).
+        """
+        lookup = np.empty(len(self.states), dtype=np.int64)
+        lookup[colex_rank(self.states)] = np.arange(len(self.states))
+
+        edges = []
+        for i in range(self.n):
+            j = (i + 1) % self.n
+            has_i = self.states == i
+            rows = np.flatnonzero(has_i.any(axis=1) & ~(self.states == j).any(axis=1))
+
+            moved = self.states[rows].copy()
+            moved[has_i[rows]] = j
+            moved.sort(axis=1)
+            edges.append((rows, lookup[colex_rank(moved)]))
+
+        return edges
+
+    def initial_state(self):
+        return np.full(len(self.states), 1 / np.sqrt(len(self.states)), dtype=np.complex128)
+
+    def statevector(self, gammas, betas):
+        psi = self.initial_state()
+
+        for gamma, beta in zip(gammas, betas):
+            psi *= np.exp(1j * gamma * self.values)
+
+            c, s = np.cos(beta), -1j * np.sin(beta)
+            for a, b in self.edges:
+                psi_a = psi[a]
+                psi_b = psi[b]
+                psi[a] = c * psi_a + s * psi_b
+                psi[b] = c * psi_b + s * psi_a
+
+        return psi
+
+    def probabilities(self, gammas, betas):
+        psi = self.statevector(gammas, betas)
+        return psi.real ** 2 + psi.imag ** 2
+
+    def expectation(self, gammas, betas):
+        return float(self.probabilities(gammas, betas) @ self.values)
+
+    def sweep(self, gammas, betas):
+        """
+        p = 1 expectation on a grid: (len(gammas) × len(betas)) array.
+        """
+        return np.array([[self.expectation([g], [b]) for b in betas] for g in gammas])
+
+    def optimize(self, p=1, grid=16, maxiter=200):
+        """
+        Parameters maximizing the expectation at depth p.
+
+        Starts from the best point of a p = 1 grid sweep, then grows the
+        depth one layer at a time, interpolating the previous schedule
+        to the new length and refining it with Nelder-Mead.
+
+        Returns: (gammas, betas, expectation)
+        """
+        # Deferred: scipy.optimize would be paid at optimizer import
+        from scipy.optimize import minimize
+
+        gamma_grid = np.linspace(0, 2 * np.pi / self._value_scale(), grid, endpoint=False)
+        beta_grid = np.linspace(0, np.pi, grid, endpoint=False)
+        surface = self.sweep(gamma_grid, beta_grid)
+        g, b = np.unravel_index(np.argmax(surface), surface.shape)
+        params = np.array([gamma_grid[g], beta_grid[b]])
+
+        def objective(x):
+            depth = len(x) // 2
+            return -self.expectation(x[:depth], x[depth:])
+
+        for depth in range(1, p + 1):
+            if depth > 1:
+                params = np.concatenate([
+                    _interpolate(params[:depth - 1], depth),
+                    _interpolate(params[depth - 1:], depth),
+                ])
+            params = minimize(
+                objective, params, method="Nelder-Mead", options={"maxiter": maxiter}
+            ).x
+
+        return params[:p], params[p:], -objective(params)
+
+    def _value_scale(self):
+        spread = float(self.values.max() - self.values.min())
+        return spread or 1.0
+
+
+def dicke_qaoa(recovery, synergy, k, p=1, grid=16, maxiter=200, shots=1024, seed=None):
+    """
+    Backend wrapper: optimize DickeQAOA parameters at depth p, then
+    sample `shots` subsets from the final state and return the best.
+
+    seed: int or np.random.Generator for sampling
+
+    Returns: SubsetResult with status "FEASIBLE"; stats hold the
+             schedule, expectation, approximation ratio
+             (expectation / optimum) and probability of the optimum
+    """
+    qaoa = DickeQAOA(recovery, synergy, k)
+    gammas, betas, expectation = qaoa.optimize(p=p, grid=grid, maxiter=maxiter)
+
+    probs = qaoa.probabilities(gammas, betas)
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(len(probs), size=shots, p=probs / probs.sum())
+    best = samples[np.argmax(qaoa.values[samples])]
+
+    stats = {
+        "gammas": gammas.tolist(),
+        "betas": betas.tolist(),
+        "expectation": expectation,
+        "approximation_ratio": expectation / qaoa.best_value if qaoa.best_value else None,
+        "optimum_probability": float(probs[qaoa.values >= qaoa.best_value - 1e-12].sum()),
+        "subspace_size": len(qaoa.states),
+    }
+    return SubsetResult(qaoa.states[best], qaoa.values[best], qaoa.n,
+                        status="FEASIBLE", stats=stats)
+
+
+def _interpolate(schedule, length):
+    """
+    Stretch a parameter schedule to `length` layers (INTERP start).
+    """
+    if len(schedule) == 1:
+        return np.repeat(schedule, length)
+    old = np.linspace(0, 1, len(schedule))
+    return np.interp(np.linspace(0, 1, length), old, schedule)
@@ -0,0 +1,329 @@
+import time
+
+import numpy as np
+
+from core.quantum.selection import SubsetResult, subset_value
+
+# Smallest improvement local search accepts, so float noise cannot cycle
+IMPROVEMENT_TOLERANCE = 1e-12
+
+
+def simulated_annealing(recovery, synergy, k, restarts=8, sweeps=None,
+                        t_start=None, t_end=None, seed=None, time_limit=None,
+                        start=None):
+    """
+    Simulated annealing over exactly-k subsets by one-in / one-out
+    swaps, all restarts vectorized as rows.
+
+    sweeps: n proposed swaps per chain each (default 20, warm 5)
+    t_start / t_end: geometric schedule (default: scaled to swap deltas)
+    start: optional k indices every chain starts from (warm start)
+    """
+    recovery, synergy, n = _prepare(recovery, synergy, k)
+    rng = np.random.default_rng(seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    sel, unsel, gain, value = _initial_state(rng, recovery, synergy, k, restarts, start)
+    rows = np.arange(restarts)
+    best_value = value.copy()
+    best_sel = sel.copy()
+
+    if k == n:
+        return _best_result(best_sel, recovery, synergy, n, {"steps": 0})
+
+    if sweeps is None:
+        sweeps = 20 if start is None else 5
+    steps = max(1, sweeps * n)
+    if t_start is None or t_end is None:
+        a = rng.integers(0, k, restarts)
+        b = rng.integers(0, n - k, restarts)
+        spread = np.abs(_swap_delta(rows, sel[rows, a], unsel[rows, b], gain, synergy))
+        scale = float(np.mean(spread)) or 1.0
+        if start is not None:
+            scale *= 0.1
+        t_start = scale if t_start is None else t_start
+        t_end = scale * 1e-3 if t_end is None else t_end
+    cooling = (t_end / t_start) ** (1.0 / steps)
+
+    # gain[j] = recovery[j] + synergy of j with the selection, so a
+    # swap i -> j scores gain[j] - gain[i] - synergy[i][j]
+    temperature = t_start
+    step = 0
+    for step in range(steps):
+        a = rng.integers(0, k, restarts)
+        b = rng.integers(0, n - k, restarts)
+        i = sel[rows, a]
+        j = unsel[rows, b]
+
+        delta = _swap_delta(rows, i, j, gain, synergy)
+        accept = (delta >= 0) | (
+            rng.random(restarts) < np.exp(np.minimum(delta, 0.0) / temperature)
+        )
+
+        if accept.any():
+            r = rows[accept]
+            gain[r] += synergy[j[accept]] - synergy[i[accept]]
+            sel[r, a[accept]] = j[accept]
+            unsel[r, b[accept]] = i[accept]
+            value[r] += delta[accept]
+
+            improved = value > best_value
+            best_value[improved] = value[improved]
+            best_sel[improved] = sel[improved]
+
+        temperature *= cooling
+        if deadline is not None and step % 64 == 0 and time.perf_counter() > deadline:
+            break
+
+    return _best_result(best_sel, recovery, synergy, n, {"steps": step + 1})
+
+
+def tabu_search(recovery, synergy, k, restarts=4, iterations=None,
+                tenure=None, seed=None, time_limit=None, start=None):
+    """
+    Tabu search over exactly-k subsets: best non-tabu swap per
+    iteration, all restarts vectorized as rows.
+
+    iterations: moves per restart (default 10 * n, warm 2 * n)
+    tenure: iterations a dropped drug may not re-enter
+    start: optional k indices every restart starts from (warm start)
+    """
+    recovery, synergy, n = _prepare(recovery, synergy, k)
+    rng = np.random.default_rng(seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    sel, unsel, gain, value = _initial_state(rng, recovery, synergy, k, restarts, start)
+    rows = np.arange(restarts)
+    best_value = value.copy()
+    best_sel = sel.copy()
+
+    if k == n:
+        return _best_result(best_sel, recovery, synergy, n, {"iterations": 0})
+
+    iterations = iterations or (10 * n if start is None else 2 * n)
+    tenure = tenure or min(10, (n - k) // 4) + 1
+    hold = max(1, k // 2)
+    no_add_until = np.zeros((restarts, n), dtype=np.int64)
+    no_drop_until = np.zeros((restarts, n), dtype=np.int64)
+
+    it = 0
+    for it in range(iterations):
+        g_in = np.take_along_axis(gain, sel, axis=1)
+        g_out = np.take_along_axis(gain, unsel, axis=1)
+        delta = (
+            g_out[:, None, :] - g_in[:, :, None]
+            - synergy[sel[:, :, None], unsel[:, None, :]]
+        )
+
+        tabu = (
+            (np.take_along_axis(no_drop_until, sel, axis=1) > it)[:, :, None]
+            | (np.take_along_axis(no_add_until, unsel, axis=1) > it)[:, None, :]
+        )
+        # Tabu moves are allowed when they beat the restart's best;
+        # if every move is tabu the best one is taken anyway
+        aspiration = value[:, None, None] + delta > best_value[:, None, None]
+        allowed = np.where(tabu & ~aspiration, -np.inf, delta).reshape(restarts, -1)
+
+        flat = allowed.argmax(axis=1)
+        stuck = ~np.isfinite(allowed[rows, flat])
+        flat[stuck] = delta.reshape(restarts, -1)[stuck].argmax(axis=1)
+
+        a, b = np.divmod(flat, n - k)
+        move = delta[rows, a, b]
+        i = sel[rows, a]
+        j = unsel[rows, b]
+
+        gain += synergy[j] - synergy[i]
+        sel[rows, a] = j
+        unsel[rows, b] = i
+        value += move
+        no_add_until[rows, i] = it + tenure + rng.integers(0, 3, restarts)
+        no_drop_until[rows, j] = it + hold
+
+        improved = value > best_value
+        best_value[improved] = value[improved]
+        best_sel[improved] = sel[improved]
+
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+    return _best_result(best_sel, recovery, synergy, n, {"iterations": it + 1})
+
+
+def greedy_local_search(recovery, synergy, k, swaps=2, starts=8, candidates=64,
+                        max_rounds=None, start=None):
+    """
+    Multi-start greedy construction, each followed by steepest-ascent
+    1-swap / 2-swap local search; returns the best.
+
+    swaps: 0 (greedy only), 1 or 2 (largest move size searched)
+    starts: greedy runs, each forcing one of the top-recovery drugs first
+    candidates: entering drugs considered per selected pair in 2-swaps
+    max_rounds: cap on improving moves per start (default: unlimited)
+    start: optional k indices to search from instead (warm start)
+    """
+    recovery, synergy, n = _prepare(recovery, synergy, k)
+
+    if start is None:
+        initial = _greedy(recovery, synergy, k, starts)
+    else:
+        initial = np.unique(np.asarray(start, dtype=np.int64))[None, :]
+        if initial.shape[1] != k:
+            raise ValueError(f"start must hold {k} distinct indices")
+
+    best, stats = None, {"swaps1": 0, "swaps2": 0, "rounds": 0}
+    for sel in initial:
+        sel, moves = _local_search(sel, recovery, synergy, swaps, candidates, max_rounds)
+        for key in stats:
+            stats[key] += moves[key]
+
+        value = subset_value(sel, recovery, synergy)
+        if best is None or value > best[1]:
+            best = (sel, value)
+
+    stats["starts"] = len(initial)
+    return SubsetResult(best[0], best[1], n, status="FEASIBLE", stats=stats)
+
+
+def _greedy(recovery, synergy, k, starts):
+    """
+    Distinct greedy selections, sorted, one per forced first pick
+    among the `starts` highest-recovery drugs (which includes the
+    plain greedy run).
+    """
+    n = len(recovery)
+    starts = min(starts, n)
+
+    first = np.argpartition(-recovery, starts - 1)[:starts]
+
+    rows = np.arange(len(first))
+    sel = np.empty((len(first), k), dtype=np.int64)
+    sel[:, 0] = first
+    gain = recovery + synergy[first]
+    gain[rows, first] = -np.inf
+
+    for t in range(1, k):
+        j = np.argmax(gain, axis=1)
+        sel[:, t] = j
+        gain += synergy[j]
+        gain[rows, j] = -np.inf
+
+    return np.unique(np.sort(sel, axis=1), axis=0)
+
+
+def _local_search(sel, recovery, synergy, swaps, candidates, max_rounds):
+    n, k = len(recovery), len(sel)
+    sel = sel.copy()
+    unsel = np.setdiff1d(np.arange(n), sel)
+    gain = recovery + synergy[sel].sum(axis=0)
+    moves = {"swaps1": 0, "swaps2": 0, "rounds": 0}
+
+    while k < n and swaps > 0 and (max_rounds is None or moves["rounds"] < max_rounds):
+        moves["rounds"] += 1
+
+        delta = gain[unsel][None, :] - gain[sel][:, None] - synergy[np.ix_(sel, unsel)]
+        a, b = np.unravel_index(np.argmax(delta), delta.shape)
+        if delta[a, b] > IMPROVEMENT_TOLERANCE:
+            i, j = sel[a], unsel[b]
+            gain += synergy[j] - synergy[i]
+            sel[a], unsel[b] = j, i
+            moves["swaps1"] += 1
+            continue
+
+        if swaps < 2 or k < 2 or n - k < 2:
+            break
+
+        move = _best_pair_swap(sel, unsel, gain, synergy, candidates)
+        if move is None:
+            break
+
+        (a1, a2), (b1, b2) = move
+        for a, b in ((a1, b1), (a2, b2)):
+            i, j = sel[a], unsel[b]
+            gain += synergy[j] - synergy[i]
+            sel[a], unsel[b] = j, i
+        moves["swaps2"] += 1
+
+    return sel, moves
+
+
+def _best_pair_swap(sel, unsel, gain, synergy, candidates):
+    """
+    Best improving exchange of two selected for two unselected drugs,
+    as ((a1, a2), (b1, b2)) positions in sel / unsel, or None.
+
+    Dropping i1, i2 and adding j1, j2 changes the value by
+        h(j1) + h(j2) + synergy[j1][j2] - gain[i1] - gain[i2] + synergy[i1][i2]
+    with h(j) = gain[j] - synergy[i1][j] - synergy[i2][j].
+    """
+    best_delta, best_move = IMPROVEMENT_TOLERANCE, None
+    size = min(candidates, len(unsel))
+
+    for a1 in range(len(sel)):
+        for a2 in range(a1 + 1, len(sel)):
+            i1, i2 = sel[a1], sel[a2]
+            h = gain[unsel] - synergy[i1, unsel] - synergy[i2, unsel]
+
+            top = np.argpartition(h, len(h) - size)[-size:]
+            block = h[top][:, None] + h[top][None, :] + synergy[np.ix_(unsel[top], unsel[top])]
+            block[np.tril_indices(size)] = -np.inf
+
+            p, q = np.unravel_index(np.argmax(block), block.shape)
+            delta = block[p, q] - gain[i1] - gain[i2] + synergy[i1, i2]
+            if delta > best_delta:
+                best_delta, best_move = delta, ((a1, a2), (top[p], top[q]))
+
+    return best_move
+
+
+def _prepare(recovery, synergy, k):
+    recovery = np.asarray(recovery, dtype=np.float64)
+    synergy = np.asarray(synergy, dtype=np.float64)
+    # Copy only when the diagonal needs clearing (large N: n^2 floats)
+    if np.diagonal(synergy).any():
+        synergy = synergy.copy()
+        np.fill_diagonal(synergy, 0.0)
+    n = len(recovery)
+
+    if not 0 < k <= n:
+        raise ValueError(f"k must be in 1..{n}, got {k}")
+    return recovery, synergy, n
+
+
+def _initial_state(rng, recovery, synergy, k, restarts, start=None):
+    """
+    Random k-subset per restart, or `start` for all of them:
+    (sel, unsel, gain, value).
+    """
+    n = len(recovery)
+    if start is None:
+        perm = np.argsort(rng.random((restarts, n)), axis=1)
+    else:
+        start = np.unique(np.asarray(start, dtype=np.int64))
+        if len(start) != k:
+            raise ValueError(f"start must hold {k} distinct indices")
+        rest = np.setdiff1d(np.arange(n), start)
+        perm = np.tile(np.concatenate([start, rest]), (restarts, 1))
+    sel, unsel = perm[:, :k].copy(), perm[:, k:].copy()
+
+    mask = np.zeros((restarts, n), dtype=np.float64)
+    np.put_along_axis(mask, sel, 1.0, axis=1)
+    gain = recovery + mask @ synergy
+
+    # value = sum(recovery[S]) + 1/2 · sum over S of synergy with S
+    g_in = np.take_along_axis(gain, sel, axis=1)
+    r_in = recovery[sel]
+    value = r_in.sum(axis=1) + (g_in - r_in).sum(axis=1) / 2
+
+    return sel, unsel, gain, value
+
+
+def _swap_delta(rows, i, j, gain, synergy):
+    return gain[rows, j] - gain[rows, i] - synergy[i, j]
+
+
+def _best_result(best_sel, recovery, synergy, n, stats):
+    values = [subset_value(s, recovery, synergy) for s in best_sel]
+    winner = int(np.argmax(values))
+    stats["restart_values"] = values
+    return SubsetResult(best_sel[winner], values[winner], n, status="FEASIBLE", stats=stats)
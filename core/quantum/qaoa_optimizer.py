@@ -1,6 +1,34 @@
-from qiskit_optimization import QuadraticProgram
-from qiskit_optimization.algorithms import MinimumEigenOptimizer
-from qiskit_algorithms.minimum_eigensolvers import NumPyMinimumEigensolver
+import numpy as np
+
+from core.quantum.dicke_qaoa import dicke_qaoa
+from core.quantum.exact_solver import branch_and_bound, top_subsets
+from core.quantum.heuristic_solvers import (
+    greedy_local_search,
+    simulated_annealing,
+    tabu_search,
+)
+from core.profiling import profiled
+from core.quantum.qubo import QUBO, default_penalty, objective_arrays
+from core.quantum.selection import DrugSelectionProblem, problem_arrays
+
+# Classical backends solving the k-subset objective directly
+# (dicke_qaoa is QAOA simulated classically on the k-subset states):
+# callable(recovery, synergy, k, **options) -> SubsetResult
+CLASSICAL_BACKENDS = {
+    "branch_and_bound": branch_and_bound,
+    "simulated_annealing": simulated_annealing,
+    "tabu_search": tabu_search,
+    "greedy": greedy_local_search,
+    "dicke_qaoa": dicke_qaoa,
+}
+
+# Keyword each backend takes a warm-start selection by
+WARM_START_OPTION = {
+    "branch_and_bound": "incumbent",
+    "simulated_annealing": "start",
+    "tabu_search": "start",
+    "greedy": "start",
+}
 
 
 class QuantumDrugOptimizer:
@@ -11,41 +39,153 @@ class QuantumDrugOptimizer:
 
     This is the standard benchmark baseline used in
     quantum optimization research.
+
+    backend: "eigensolver" (default) or a name in CLASSICAL_BACKENDS,
+             which solve the same objective and pick_k constraint
+             without building the 2^n Hamiltonian
+    options: keyword arguments passed to the classical backend
+
+    qiskit is imported only when the eigensolver is used, so problem
+    building and the classical backends work without it installed.
     """
 
-    def __init__(self):
-        self.solver = NumPyMinimumEigensolver()
+    def __init__(self, backend="eigensolver", **options):
+        if backend != "eigensolver" and backend not in CLASSICAL_BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
 
-    def build_problem(self, drug_names, recovery_scores, synergy_matrix, k=3):
-        qp = QuadraticProgram()
+        self.backend = backend
+        self.options = options
+        self._solver = None
 
-        n = len(drug_names)
-        for i in range(n):
-            qp.binary_var(name=f"x{i}")
+    @property
+    def solver(self):
+        """
+        Minimum eigensolver used by the "eigensolver" backend
+        (default: NumPyMinimumEigensolver, created on first use).
+        """
+        if self._solver is None:
+            from qiskit_algorithms.minimum_eigensolvers import NumPyMinimumEigensolver
 
-        # Objective: maximize recovery + synergy
-        linear = {f"x{i}": float(recovery_scores[i]) for i in range(n)}
+            self._solver = NumPyMinimumEigensolver()
+        return self._solver
+
+    @solver.setter
+    def solver(self, solver):
+        self._solver = solver
+
+    @profiled
+    def build_problem(self, drug_names, recovery_scores, synergy_matrix, k=3,
+                      tolerance=0.0):
+        """
+        DrugSelectionProblem over x0..x{n-1}, built from whole arrays.
+        Call .to_quadratic_program() for the qiskit form, and
+        .with_k() to change k without rebuilding the arrays.
+
+        tolerance: drop synergies with |value| <= tolerance
+        """
+        recovery, synergy, _ = self._objective(recovery_scores, synergy_matrix, tolerance)
+
+        n = len(drug_names)
+        if n != len(recovery):
+            raise ValueError(f"{n} drug names for {len(recovery)} recovery scores")
 
-        quadratic = {}
-        for i in range(n):
-            for j in range(i + 1, n):
-                quadratic[(f"x{i}", f"x{j}")] = float(synergy_matrix[i][j])
+        return DrugSelectionProblem(drug_names, recovery, synergy, k)
 
-        qp.maximize(linear=linear, quadratic=quadratic)
+    @profiled
+    def build_qubo(self, recovery_scores, synergy_matrix, k=3, penalty=None,
+                   tolerance=0.0):
+        """
+        Penalty-encoded QUBO of the same problem (see core.quantum.qubo).
 
-        # Hard constraint: pick exactly k drugs
-        qp.linear_constraint(
-            linear={f"x{i}": 1 for i in range(n)},
-            sense="==",
-            rhs=k,
-            name="pick_k"
+        penalty: cardinality weight (default: 1 + total absolute weight)
+        tolerance: drop synergies with |value| <= tolerance (sparse result)
+        """
+        recovery, synergy, auto_penalty = self._objective(
+            recovery_scores, synergy_matrix, tolerance
         )
+        return QUBO(recovery, synergy, k, auto_penalty if penalty is None else penalty)
 
-        return qp
+    def _objective(self, recovery_scores, synergy_matrix, tolerance):
+        """
+        (recovery, synergy, default penalty) as read-only copies, so
+        problems sharing them (see with_k) cannot be edited in place.
+        """
+        recovery, synergy = objective_arrays(recovery_scores, synergy_matrix, tolerance)
 
+        recovery.setflags(write=False)
+        if isinstance(synergy, np.ndarray):
+            synergy.setflags(write=False)
 
+        return recovery, synergy, default_penalty(recovery, synergy)
 
+    @profiled
     def solve(self, qp):
+        """
+        qp: DrugSelectionProblem or QuadraticProgram
+        """
+        if self.backend in CLASSICAL_BACKENDS:
+            recovery, synergy, k = problem_arrays(qp)
+            return CLASSICAL_BACKENDS[self.backend](recovery, synergy, k, **self.options)
+
+        from qiskit_optimization.algorithms import MinimumEigenOptimizer
+
+        if isinstance(qp, DrugSelectionProblem):
+            qp = qp.to_quadratic_program()
+
         optimizer = MinimumEigenOptimizer(self.solver)
         result = optimizer.solve(qp)
         return result
+
+    @profiled
+    def solve_top(self, qp, m=20):
+        """
+        Ranked shortlist of the m best distinct k-combinations, found
+        exactly in one branch-and-bound pass whatever the backend.
+
+        qp: DrugSelectionProblem or QuadraticProgram
+        Returns: list of SubsetResult, best first
+        """
+        recovery, synergy, k = problem_arrays(qp)
+        return top_subsets(recovery, synergy, k, m=m)
+
+    @profiled
+    def resolve(self, previous_problem, previous_result, diff=None):
+        """
+        Re-solve after an incremental update, warm-started from the
+        previous solution: branch-and-bound takes it as the incumbent,
+        the heuristics start every restart from it (with a shorter
+        default schedule). Other backends solve cold.
+
+        previous_problem: DrugSelectionProblem that was solved
+        previous_result: its result (SubsetResult or qiskit result)
+        diff: ProblemDiff (None re-solves the same problem)
+
+        Returns: (problem, result); result.stats["delta"] names the drugs
+                 that entered and left the selected set
+        """
+        problem = previous_problem if diff is None else diff.apply(previous_problem)
+        previous_names = [
+            previous_problem.drug_names[i]
+            for i, v in enumerate(previous_result.x) if round(v) == 1
+        ]
+
+        if self.backend in WARM_START_OPTION:
+            recovery, synergy, k = problem.arrays()
+            options = dict(self.options)
+            options[WARM_START_OPTION[self.backend]] = problem.warm_start(previous_names)
+            result = CLASSICAL_BACKENDS[self.backend](recovery, synergy, k, **options)
+        else:
+            result = self.solve(problem)
+            if not hasattr(result, "stats"):
+                result.stats = {}
+
+        selected_names = [
+            problem.drug_names[i] for i, v in enumerate(result.x) if round(v) == 1
+        ]
+        result.stats["delta"] = {
+            "added": sorted(set(selected_names) - set(previous_names)),
+            "removed": sorted(set(previous_names) - set(selected_names)),
+            "fval_change": float(result.fval - previous_result.fval),
+        }
+
+        return problem, result
@@ -0,0 +1,78 @@
+import numpy as np
+from scipy import sparse
+
+
+class QUBO:
+    """
+    Penalty form of the drug selection problem, to be minimized:
+
+        E(x) = -(recovery · x + x^T synergy x) + penalty · (sum(x) - k)^2
+
+    linear: (n,) recovery scores
+    synergy: (n × n) upper-triangular pairwise terms, dense or
+             scipy.sparse when near-zero synergies were dropped
+    k: number of drugs to pick
+    penalty: weight of the cardinality term
+    """
+
+    def __init__(self, linear, synergy, k, penalty):
+        self.linear = linear
+        self.synergy = synergy
+        self.k = k
+        self.penalty = penalty
+        self.offset = penalty * k * k
+
+    @property
+    def n(self):
+        return len(self.linear)
+
+    def matrix(self):
+        """
+        Dense upper-triangular Q with E(x) = x^T Q x + offset.
+        """
+        n = self.n
+        synergy = self.synergy.toarray() if sparse.issparse(self.synergy) else self.synergy
+
+        Q = np.triu(np.full((n, n), 2.0 * self.penalty), 1) - synergy
+        Q[np.diag_indices(n)] = -self.linear + self.penalty * (1 - 2 * self.k)
+        return Q
+
+    def energy(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        pair_terms = x @ (self.synergy @ x)
+        return float(
+            -(self.linear @ x) - pair_terms
+            + self.penalty * (x.sum() - self.k) ** 2
+        )
+
+
+def objective_arrays(recovery_scores, synergy_matrix, tolerance=0.0):
+    """
+    Validated (recovery, upper-triangular synergy) arrays, copied
+    from the inputs.
+
+    tolerance: synergies with |value| <= tolerance are dropped and the
+               result is returned as a scipy.sparse CSR matrix
+    """
+    recovery = np.array(recovery_scores, dtype=np.float64, copy=True)
+    synergy = np.triu(np.asarray(synergy_matrix, dtype=np.float64), 1)
+
+    n = len(recovery)
+    if synergy.shape != (n, n):
+        raise ValueError(f"synergy_matrix must be {n} × {n}, got {synergy.shape}")
+
+    if tolerance > 0:
+        synergy[np.abs(synergy) <= tolerance] = 0.0
+        synergy = sparse.csr_matrix(synergy)
+
+    return recovery, synergy
+
+
+def default_penalty(recovery, synergy):
+    """
+    1 + total absolute objective weight, the same rule as qiskit's
+    LinearEqualityToPenalty: no constraint violation can pay off.
+    """
+    total = abs(synergy).sum() if sparse.issparse(synergy) else np.abs(synergy).sum()
+    return 1.0 + float(np.abs(recovery).sum() + total)
+
@@ -0,0 +1,226 @@
+import numpy as np
+from scipy import sparse
+
+
+class DrugSelectionProblem:
+    """
+    Pick exactly k drugs maximizing
+        sum(recovery[i]) + sum(synergy[i][j]) over i < j selected
+
+    Plain NumPy, so classical backends never need qiskit; the
+    QuadraticProgram for qiskit solvers is built on request.
+
+    drug_names: list of n names (variables are x0..x{n-1})
+    recovery: (n,) scores
+    synergy: (n × n) upper-triangular, dense or scipy.sparse
+    k: number of drugs to pick
+    """
+
+    def __init__(self, drug_names, recovery, synergy, k):
+        self.drug_names = list(drug_names)
+        self.recovery = recovery
+        self.synergy = synergy
+        self.k = int(k)
+
+    @property
+    def n(self):
+        return len(self.recovery)
+
+    def arrays(self):
+        """
+        (recovery, symmetric synergy with zero diagonal, k)
+        """
+        upper = self.synergy.toarray() if sparse.issparse(self.synergy) else self.synergy
+        return np.array(self.recovery), upper + upper.T, self.k
+
+    def with_k(self, k):
+        """
+        Same drugs and arrays (shared, not copied), picking k instead.
+        """
+        return DrugSelectionProblem(self.drug_names, self.recovery, self.synergy, k)
+
+    def to_quadratic_program(self):
+        from qiskit_optimization import QuadraticProgram
+
+        qp = QuadraticProgram()
+        qp.binary_var_list(self.n, name="x")
+
+        # Objective: maximize recovery + synergy
+        qp.maximize(linear=self.recovery, quadratic=self.synergy)
+
+        # Hard constraint: pick exactly k drugs
+        qp.linear_constraint(
+            linear=np.ones(self.n),
+            sense="==",
+            rhs=self.k,
+            name="pick_k"
+        )
+
+        return qp
+
+    def warm_start(self, selected_names):
+        """
+        k indices close to a previous selection: the named drugs still
+        in the problem, topped up (or trimmed) greedily by gain.
+        """
+        recovery, synergy, k = self.arrays()
+        index = {name: i for i, name in enumerate(self.drug_names)}
+        chosen = [index[name] for name in selected_names if name in index]
+
+        while len(chosen) > k:
+            gain = recovery[chosen] + synergy[np.ix_(chosen, chosen)].sum(axis=1)
+            chosen.pop(int(np.argmin(gain)))
+
+        gain = recovery + synergy[chosen].sum(axis=0)
+        gain[chosen] = -np.inf
+        while len(chosen) < k:
+            j = int(np.argmax(gain))
+            chosen.append(j)
+            gain += synergy[j]
+            gain[j] = -np.inf
+
+        return sorted(chosen)
+
+    def __repr__(self):
+        return f"DrugSelectionProblem(n={self.n}, k={self.k})"
+
+
+class ProblemDiff:
+    """
+    Incremental update to a DrugSelectionProblem, by drug name.
+
+    removed: names to drop
+    added: {name: (recovery, {other_name: synergy})} for new drugs;
+           unlisted synergies with other drugs are 0
+    recovery: {name: new recovery score}
+    synergy: {(name_a, name_b): new synergy}
+    k: new number of drugs to pick (default: unchanged)
+    """
+
+    def __init__(self, removed=(), added=None, recovery=None, synergy=None, k=None):
+        self.removed = set(removed)
+        self.added = added or {}
+        self.recovery = recovery or {}
+        self.synergy = synergy or {}
+        self.k = k
+
+    def apply(self, problem):
+        recovery, synergy, k = problem.arrays()
+
+        keep = [i for i, name in enumerate(problem.drug_names) if name not in self.removed]
+        names = [problem.drug_names[i] for i in keep]
+        for name in self.added:
+            if name in names:
+                raise ValueError(f"Drug already in problem: {name}")
+        names += list(self.added)
+        self._check_names(names)
+
+        n_kept = len(keep)
+        new_recovery = np.zeros(len(names), dtype=np.float64)
+        new_recovery[:n_kept] = recovery[keep]
+        new_synergy = np.zeros((len(names), len(names)), dtype=np.float64)
+        new_synergy[:n_kept, :n_kept] = synergy[np.ix_(keep, keep)]
+
+        index = {name: i for i, name in enumerate(names)}
+        for name, (score, row) in self.added.items():
+            new_recovery[index[name]] = score
+            for other, value in row.items():
+                new_synergy[index[name], index[other]] = value
+                new_synergy[index[other], index[name]] = value
+
+        for name, score in self.recovery.items():
+            new_recovery[index[name]] = score
+        for (a, b), value in self.synergy.items():
+            new_synergy[index[a], index[b]] = value
+            new_synergy[index[b], index[a]] = value
+
+        return DrugSelectionProblem(
+            names, new_recovery, np.triu(new_synergy, 1), k if self.k is None else self.k
+        )
+
+    def _check_names(self, names):
+        """
+        Raise ValueError for updates naming a drug that is not in the
+        result (removed by this diff or never in the problem).
+        """
+        present = set(names)
+
+        def missing(name, where):
+            if name in present:
+                return
+            reason = "removed" if name in self.removed else "not in problem"
+            raise ValueError(f"{where} names drug {name!r} ({reason})")
+
+        for name, (_, row) in self.added.items():
+            for other in row:
+                missing(other, f"Synergy row of added drug {name!r}")
+        for name in self.recovery:
+            missing(name, "Recovery update")
+        for a, b in self.synergy:
+            missing(a, f"Synergy update ({a!r}, {b!r})")
+            missing(b, f"Synergy update ({a!r}, {b!r})")
+
+
+class SubsetResult:
+    """
+    Result of a classical k-subset backend.
+
+    Mirrors the fields of qiskit's OptimizationResult used by the
+    experiments (x, fval, status), so callers can switch backends
+    without changing how results are read.
+    """
+
+    def __init__(self, selected, fval, n, status="SUCCESS", stats=None):
+        self.selected = tuple(sorted(int(i) for i in selected))
+        self.fval = float(fval)
+        self.x = np.zeros(n, dtype=np.float64)
+        self.x[list(self.selected)] = 1.0
+        self.status = status
+        self.stats = stats or {}
+
+    @property
+    def variables_dict(self):
+        return {f"x{i}": float(v) for i, v in enumerate(self.x)}
+
+    def __repr__(self):
+        return (
+            f"SubsetResult(selected={self.selected}, fval={self.fval:.6g}, "
+            f"status={self.status})"
+        )
+
+
+def problem_arrays(qp):
+    """
+    Recover (recovery, synergy, k) from a DrugSelectionProblem or a
+    QuadraticProgram of the same form (as made by to_quadratic_program).
+
+    Returns:
+    - recovery: (n,) linear objective (maximization sense)
+    - synergy: (n × n) symmetric pairwise terms, zero diagonal
+    - k: right-hand side of the "pick_k" constraint
+    """
+    if isinstance(qp, DrugSelectionProblem):
+        return qp.arrays()
+
+    linear = qp.objective.linear.to_array()
+    quadratic = qp.objective.quadratic.to_array()
+
+    # x_i * x_i == x_i for binaries, so diagonal terms are linear
+    recovery = linear + np.diag(quadratic)
+    synergy = quadratic + quadratic.T
+    np.fill_diagonal(synergy, 0.0)
+
+    if qp.objective.sense.name == "MINIMIZE":
+        recovery, synergy = -recovery, -synergy
+
+    k = int(round(qp.get_linear_constraint("pick_k").rhs))
+    return recovery, synergy, k
+
+
+def subset_value(selected, recovery, synergy):
+    """
+    sum(recovery[i]) + sum(synergy[i][j]) over i < j in selected
+    """
+    selected = np.asarray(selected, dtype=np.int64)
+    block = synergy[np.ix_(selected, selected)]
+    return float(recovery[selected].sum() + np.triu(block, 1).sum())
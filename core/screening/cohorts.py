@@ -0,0 +1,44 @@
+import numpy as np
+
+from core.chemistry.drug_panel import DrugPanel
+from core.biology.system_distance import (
+    BATCH_BLOCK_ELEMENTS,
+    batch_system_distance,
+    edge_arrays,
+)
+from core.profiling import profiled
+
+
+@profiled
+def cohort_recovery_matrix(graph, healthy, disease_matrix, drugs):
+    """
+    Recovery score of every drug in every cohort, as batched array work.
+
+    graph: nx.Graph or ArrayNetwork
+    healthy: (n_nodes,) reference state, aligned with graph.nodes()
+    disease_matrix: (n_cohorts × n_nodes), e.g. from
+                    DiseaseStateModel.build_state_matrix
+    drugs: list of DrugModel, or a DrugPanel compiled for this graph
+
+    Returns: (n_drugs × n_cohorts) matrix of
+             baseline_distance - post_drug_distance
+    """
+    node_names, src, dst, weight = edge_arrays(graph)
+    disease_matrix = np.atleast_2d(np.asarray(disease_matrix, dtype=np.float64))
+    n_cohorts, n_nodes = disease_matrix.shape
+
+    baseline = batch_system_distance(healthy, disease_matrix, src, dst, weight)
+    panel = drugs if isinstance(drugs, DrugPanel) else DrugPanel(drugs, node_names)
+
+    recovery = np.empty((len(panel), n_cohorts), dtype=np.float64)
+    block = max(1, BATCH_BLOCK_ELEMENTS // max(1, n_cohorts * n_nodes))
+
+    for start in range(0, len(panel), block):
+        stop = min(start + block, len(panel))
+        post = panel.apply(disease_matrix, range(start, stop))
+        post_distance = batch_system_distance(
+            healthy, post.reshape(-1, n_nodes), src, dst, weight
+        ).reshape(stop - start, n_cohorts)
+        recovery[start:stop] = baseline[None, :] - post_distance
+
+    return recovery
@@ -0,0 +1,191 @@
+import heapq
+
+import numpy as np
+from scipy import sparse
+
+from core.biology.system_distance import IncrementalDistance
+from core.profiling import profiled
+
+
+class CombinationScreen:
+    def __init__(self, graph, healthy, disease, drugs, single_recovery=None):
+        """
+        Screens k-drug combinations by recovery score.
+
+        graph: nx.Graph or ArrayNetwork
+        healthy, disease: state dicts or arrays aligned with the graph
+        drugs: list of DrugModel
+        single_recovery: precomputed single-drug recoveries (optional)
+
+        Combinations are enumerated depth-first over a drug lattice:
+        each drug is pushed onto the shared prefix state once and scored
+        incrementally, so a combination costs O(degree of one drug's
+        targets) rather than re-applying every drug from scratch.
+        """
+        self.drugs = list(drugs)
+        self.scorer = IncrementalDistance(healthy, disease, graph)
+        self.compiled = [self.scorer.compile_effects(d.targets) for d in self.drugs]
+
+        # Upper bound on how much one drug can still lower the distance:
+        # each target's node difference can at most drop to zero, which
+        # frees diff * (sum of incident weights) / 2 over all its edges
+        network = self.scorer.network
+        strength = np.bincount(
+            np.concatenate([network.src, network.dst]),
+            weights=np.concatenate([network.weight, network.weight]),
+            minlength=network.number_of_nodes()
+        )
+        rows = np.repeat(
+            np.arange(len(self.drugs)),
+            [len(node_ids) for node_ids, _, _ in self.compiled]
+        )
+        cols = np.concatenate(
+            [node_ids for node_ids, _, _ in self.compiled] or [np.empty(0, dtype=np.int64)]
+        )
+        self._reach = sparse.csr_matrix(
+            (strength[cols] / (2 * max(1, self.scorer.n_edges)), (rows, cols)),
+            shape=(len(self.drugs), network.number_of_nodes())
+        )
+
+        if single_recovery is None:
+            single_recovery = [self.scorer.recovery(effects) for effects in self.compiled]
+        self.single_recovery = np.asarray(single_recovery, dtype=np.float64)
+
+        # Strong single drugs first, so good combinations fill the
+        # top_n early and the pruning threshold rises quickly
+        self.order = np.argsort(-self.single_recovery, kind="stable")
+        self.stats = {}
+
+    @profiled
+    def screen(self, k=2, top_n=100, min_recovery=None, prune=True, first=None):
+        """
+        k: drugs per combination
+        top_n: keep only the best top_n combinations (None = keep all;
+               memory then grows with C(n_drugs, k))
+        min_recovery: drop combinations scoring below this
+        prune: skip subtrees whose recovery bound cannot enter the top_n
+               or reach min_recovery
+        first: only the lattice branches rooted at these positions of
+               self.order (used to shard a screen across workers)
+
+        Returns: list of dicts sorted by recovery (descending):
+        - drugs: tuple of drug names, in panel order
+        - recovery: combination recovery score
+        - synergy: recovery minus the best single-drug recovery
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        order = self.order
+        n = len(order)
+        if k > n:
+            return []
+
+        reach = self._reach[order]
+        heap = []
+        stats = {"visited": 0, "pruned": 0}
+        baseline = self.scorer.baseline_distance
+
+        def threshold():
+            limit = -np.inf if min_recovery is None else min_recovery
+            if top_n is not None and len(heap) >= top_n:
+                limit = max(limit, heap[0][0])
+            return limit
+
+        def offer(recovery, positions):
+            if min_recovery is not None and recovery < min_recovery:
+                return
+            item = (recovery, tuple(sorted(order[positions].tolist())))
+            if top_n is None or len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        def visit(start, prefix, positions=None):
+            remaining = k - len(prefix)
+            recovery = baseline - self.scorer.distance
+
+            gains = None
+            limit = threshold() if prune else -np.inf
+            if limit > -np.inf:
+                # One sparse mat-vec for every drug, then a dense slice
+                gains = (reach @ self.scorer.node_diff)[start:]
+                best = np.partition(gains, len(gains) - remaining)[-remaining:]
+                if recovery + best.sum() <= limit:
+                    stats["pruned"] += 1
+                    return
+
+            if remaining == 1:
+                # Last drug: score each candidate without mutating the
+                # prefix state, dropping those whose bound cannot qualify
+                # in one vectorized mask
+                candidates = np.arange(start, n)
+                if gains is not None:
+                    candidates = candidates[recovery + gains > limit]
+                    stats["pruned"] += n - start - len(candidates)
+                stats["visited"] += len(candidates)
+
+                for pos in candidates.tolist():
+                    distance = self.scorer.distance_after_effects(self.compiled[order[pos]])
+                    offer(baseline - distance, prefix + [pos])
+                return
+
+            if positions is None:
+                positions = range(start, n - remaining + 1)
+
+            # Bound each child from this node's gains before pushing it:
+            # its own gain plus the best remaining - 1 gains after it.
+            # Children failing the bound now are dropped in one mask;
+            # survivors are rechecked as the threshold rises.
+            child_bound = None
+            if gains is not None:
+                child_bound = recovery + gains + _suffix_top_sums(gains, remaining - 1)
+                positions = np.asarray(positions, dtype=np.int64)
+                keep = child_bound[positions - start] > limit
+                stats["pruned"] += len(positions) - int(keep.sum())
+                positions = positions[keep].tolist()
+
+            for pos in positions:
+                if child_bound is not None and child_bound[pos - start] <= threshold():
+                    stats["pruned"] += 1
+                    continue
+                self.scorer.push(self.compiled[order[pos]])
+                visit(pos + 1, prefix + [pos])
+                self.scorer.pop()
+
+        if first is None:
+            visit(0, [])
+        elif k == 1:
+            for pos in first:
+                offer(self.single_recovery[order[pos]], [pos])
+        else:
+            visit(0, [], [pos for pos in first if pos <= n - k])
+        self.stats = stats
+
+        results = []
+        for recovery, combo in sorted(heap, reverse=True):
+            results.append({
+                "drugs": tuple(self.drugs[i].name for i in combo),
+                "recovery": recovery,
+                "synergy": recovery - max(self.single_recovery[i] for i in combo)
+            })
+        return results
+
+
+def _suffix_top_sums(values, m):
+    """
+    out[i] = sum of the m largest of values[i + 1:] (-inf when fewer
+    than m remain).
+    """
+    n = len(values)
+    if m == 1:
+        tail = np.maximum.accumulate(values[::-1])[::-1]
+        return np.append(tail[1:], -np.inf)
+
+    # (n × n) mask of "ranked entry lies after i", keeping its first m
+    ranked = np.argsort(-values, kind="stable")
+    after = ranked[None, :] > np.arange(n)[:, None]
+    take = after & (np.cumsum(after, axis=1) <= m)
+    out = take @ values[ranked]
+    out[after.sum(axis=1) < m] = -np.inf
+    return out
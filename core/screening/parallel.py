@@ -0,0 +1,201 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.biology.array_network import ArrayNetwork
+from core.biology.system_distance import IncrementalDistance, _aligned
+from core.profiling import profiled
+from core.screening.combinations import CombinationScreen
+
+# Per-worker state, filled by _init_worker
+_WORKER = {}
+
+
+class ParallelScreen:
+    def __init__(self, graph, healthy, disease, drugs, max_workers=None):
+        """
+        Process-pool drug and combination screening.
+
+        graph: nx.Graph or ArrayNetwork
+        healthy, disease: state dicts or arrays aligned with the graph
+        drugs: list of DrugModel
+        max_workers: pool size (default: os.cpu_count())
+
+        Edge arrays and states are placed in shared memory once; workers
+        map them read-only instead of receiving pickled copies per task.
+        Use as a context manager (or call close()) to release the pool
+        and the shared segments.
+        """
+        if not isinstance(graph, ArrayNetwork):
+            graph = ArrayNetwork.from_networkx(graph)
+
+        self.drugs = list(drugs)
+        self.max_workers = max_workers or os.cpu_count()
+        self.single_recovery = None
+
+        self._segments = []
+        self._pool = None
+        try:
+            specs = {
+                name: self._share(array)
+                for name, array in (
+                    ("src", graph.src),
+                    ("dst", graph.dst),
+                    ("weight", graph.weight),
+                    ("healthy", _aligned(healthy, graph)),
+                    ("disease", _aligned(disease, graph))
+                )
+            }
+
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(specs, graph.node_names, self.drugs)
+            )
+        except BaseException:
+            # No context manager yet to release what was already shared
+            self.close()
+            raise
+
+    def _share(self, array):
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        self._segments.append(shm)
+        return shm.name, array.shape, array.dtype.str
+
+    # ---------------------------
+    # Single drugs
+    # ---------------------------
+    def iter_singles(self, shard_size=None):
+        """
+        Yields (drug name, recovery) in completion order.
+        """
+        n = len(self.drugs)
+        shard_size = shard_size or max(1, -(-n // (4 * self.max_workers)))
+        futures = [
+            self._pool.submit(_score_singles, list(range(i, min(i + shard_size, n))))
+            for i in range(0, n, shard_size)
+        ]
+
+        for future in as_completed(futures):
+            for i, recovery in future.result():
+                yield self.drugs[i].name, recovery
+
+    @profiled
+    def screen_singles(self):
+        """
+        Returns {drug name: recovery} and caches the scores for
+        combination screens.
+        """
+        index = {drug.name: i for i, drug in enumerate(self.drugs)}
+        recovery = np.empty(len(self.drugs), dtype=np.float64)
+
+        for name, score in self.iter_singles():
+            recovery[index[name]] = score
+
+        self.single_recovery = recovery
+        return dict(zip((drug.name for drug in self.drugs), recovery.tolist()))
+
+    # ---------------------------
+    # Combinations
+    # ---------------------------
+    def iter_combinations(self, k=2, top_n=100, min_recovery=None, prune=True):
+        """
+        Shards the combination lattice by its first drug and yields each
+        shard's results (CombinationScreen.screen dicts) as it completes.
+        Every shard keeps its own top_n; see screen_combinations for
+        the merged ranking.
+        """
+        if self.single_recovery is None:
+            self.screen_singles()
+
+        futures = [
+            self._pool.submit(
+                _screen_shard, [pos], k, top_n, min_recovery, prune, self.single_recovery
+            )
+            for pos in range(len(self.drugs) - k + 1)
+        ]
+
+        for future in as_completed(futures):
+            yield future.result()
+
+    @profiled
+    def screen_combinations(self, k=2, top_n=100, min_recovery=None, prune=True):
+        """
+        Same result as CombinationScreen.screen, computed across the pool.
+        """
+        best = []
+        for shard in self.iter_combinations(k, top_n, min_recovery, prune):
+            best.extend(shard)
+            if top_n is not None:
+                best = heapq.nlargest(top_n, best, key=lambda r: (r["recovery"], r["drugs"]))
+
+        return sorted(best, key=lambda r: r["recovery"], reverse=True)
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for shm in self._segments:
+            shm.close()
+            shm.unlink()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    _WORKER.setdefault("segments", []).append(shm)
+
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _init_worker(specs, node_names, drugs):
+    arrays = {name: _attach(spec) for name, spec in specs.items()}
+
+    _WORKER["network"] = ArrayNetwork(
+        node_names, arrays["src"], arrays["dst"], arrays["weight"]
+    )
+    _WORKER["healthy"] = arrays["healthy"]
+    _WORKER["disease"] = arrays["disease"]
+    _WORKER["drugs"] = drugs
+    _WORKER["scorer"] = IncrementalDistance(
+        arrays["healthy"], arrays["disease"], _WORKER["network"]
+    )
+    _WORKER["screen"] = None
+
+
+def _score_singles(drug_ids):
+    scorer = _WORKER["scorer"]
+    drugs = _WORKER["drugs"]
+    return [(i, scorer.recovery(drugs[i].targets)) for i in drug_ids]
+
+
+def _screen_shard(first, k, top_n, min_recovery, prune, single_recovery):
+    screen = _WORKER["screen"]
+    if screen is None or not np.array_equal(screen.single_recovery, single_recovery):
+        screen = CombinationScreen(
+            _WORKER["network"],
+            _WORKER["healthy"],
+            _WORKER["disease"],
+            _WORKER["drugs"],
+            single_recovery=single_recovery
+        )
+        _WORKER["screen"] = screen
+
+    return screen.screen(k, top_n, min_recovery, prune, first=first)
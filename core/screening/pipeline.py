@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from core.biology.disease_state import DiseaseStateModel
+from core.biology.ppi_network import interaction_graph, merge_interactions
+from core.biology.system_distance import IncrementalDistance
+from core.profiling import profiled
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qbio", "pipeline")
+
+
+def content_hash(*parts):
+    """
+    sha256 of JSON-serializable parts (dict keys sorted).
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def drug_fingerprint(drug):
+    """
+    Hash of a DrugModel's name and targets: editing a drug's targets
+    invalidates its rows, renaming or reordering the panel does not
+    change anyone else's.
+    """
+    return content_hash(drug.name, sorted(drug.targets.items()))
+
+
+class ScreeningPipeline:
+    def __init__(self, builder, proteins, expression_path, drugs,
+                 model=None, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Network -> disease state -> single / pair drug scores -> synergy,
+        each stage after the network memoized on disk under a hash of
+        its inputs.
+
+        builder: PPINetworkBuilder; the network is fetched through it
+                 on every run, so its InteractionCache TTL, offline mode
+                 and local_dump decide where the edges come from
+        proteins: protein set for the network
+        expression_path: expression CSV (keyed by file content)
+        drugs: list of DrugModel
+        model: DiseaseStateModel (default: DiseaseStateModel())
+        cache_dir: where stage outputs are stored
+
+        Downstream stages are keyed on the content of the fetched
+        interactions, not on the query, so a refreshed or different
+        STRING source invalidates them.
+
+        Single and pair scores are stored as rows keyed by drug
+        fingerprint, so adding one drug to the panel computes its own
+        recovery and its n pairs, and reuses everything else.
+        """
+        self.builder = builder
+        self.proteins = list(proteins)
+        self.expression_path = expression_path
+        self.drugs = list(drugs)
+        self.model = model or DiseaseStateModel()
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.fingerprints = [drug_fingerprint(d) for d in self.drugs]
+        self.stats = {"hits": {}, "computed": {}}
+        self._memo = {}
+        self._scorer = None
+
+    # ---------------------------
+    # Storage
+    # ---------------------------
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, f"{stage}-{key}.pkl")
+
+    def _load(self, stage, key, default=None):
+        try:
+            with open(self._path(stage, key), "rb") as fh:
+                return pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return default
+
+    def _store(self, stage, key, value):
+        path = self._path(stage, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _count(self, kind, stage, n=1):
+        self.stats[kind][stage] = self.stats[kind].get(stage, 0) + n
+
+    def _stage(self, stage, key, compute):
+        """
+        Whole-stage memoization: memory, then disk, then compute().
+        """
+        if (stage, key) in self._memo:
+            return self._memo[stage, key]
+
+        value = self._load(stage, key)
+        if value is None:
+            value = compute()
+            self._store(stage, key, value)
+            self._count("computed", stage)
+        else:
+            self._count("hits", stage)
+
+        self._memo[stage, key] = value
+        return value
+
+    # ---------------------------
+    # Keys
+    # ---------------------------
+    def network_key(self):
+        """
+        Hash of the fetched interactions (edge list and scores).
+        """
+        if "network_key" not in self._memo:
+            edges = sorted(
+                (*sorted((item["preferredName_A"], item["preferredName_B"])), item["score"])
+                for item in self.interactions()
+            )
+            self._memo["network_key"] = content_hash(
+                "network", self.builder.species, self.builder.score_threshold, edges
+            )
+        return self._memo["network_key"]
+
+    def state_key(self):
+        if "state_key" not in self._memo:
+            self._memo["state_key"] = content_hash(
+                "state", self.network_key(), file_hash(self.expression_path),
+                self.model.fold_change_col
+            )
+        return self._memo["state_key"]
+
+    # ---------------------------
+    # Stages
+    # ---------------------------
+    def interactions(self):
+        """
+        Deduplicated STRING records for the protein set, fetched once
+        per pipeline through the builder (and its InteractionCache).
+        """
+        if "interactions" not in self._memo:
+            self._memo["interactions"] = merge_interactions(
+                self.builder.fetch_interactions(self.proteins)
+            )
+        return self._memo["interactions"]
+
+    @profiled
+    def network(self):
+        if "network" not in self._memo:
+            self._memo["network"] = interaction_graph(self.interactions())
+        return self._memo["network"]
+
+    @profiled
+    def disease_state(self):
+        """
+        (healthy, diseased) state dicts on the network.
+        """
+        def compute():
+            expr = self.model.load_expression_data(self.expression_path)
+            return self.model.build_state_vector(self.network(), expr)
+
+        return self._stage("state", self.state_key(), compute)
+
+    def scorer(self):
+        if self._scorer is None:
+            healthy, diseased = self.disease_state()
+            self._scorer = IncrementalDistance(healthy, diseased, self.network())
+        return self._scorer
+
+    def baseline_distance(self):
+        return self.scorer().baseline_distance
+
+    @profiled
+    def single_scores(self):
+        """
+        Recovery of each drug alone: (n_drugs,) array in panel order.
+        """
+        rows = self._rows("single")
+        missing = [i for i, fp in enumerate(self.fingerprints) if fp not in rows]
+
+        if missing:
+            scorer = self.scorer()
+            for i in missing:
+                rows[self.fingerprints[i]] = scorer.recovery(self.drugs[i].targets)
+            self._store("single", self.state_key(), rows)
+        self._count("computed", "single", len(missing))
+        self._count("hits", "single", len(self.drugs) - len(missing))
+
+        return np.array([rows[fp] for fp in self.fingerprints])
+
+    @profiled
+    def pair_scores(self):
+        """
+        Recovery of every drug pair: symmetric (n_drugs × n_drugs) array
+        in panel order, with single recoveries on the diagonal.
+
+        The stronger single drug is applied first, the order
+        CombinationScreen uses, so scores match its k = 2 screen
+        (exact ties are broken by fingerprint, not panel position).
+        """
+        single = self.single_scores()
+        rows = self._rows("pair")
+        n = len(self.drugs)
+
+        pairs = {}
+        for a in range(n):
+            for b in range(a + 1, n):
+                first, second = sorted((a, b), key=lambda i: (-single[i], self.fingerprints[i]))
+                pairs[a, b] = (first, second)
+
+        missing = [ab for ab, (f, s) in pairs.items()
+                   if (self.fingerprints[f], self.fingerprints[s]) not in rows]
+
+        if missing:
+            # One push per first drug, shared by all its missing partners
+            by_first = {}
+            for ab in missing:
+                first, second = pairs[ab]
+                by_first.setdefault(first, []).append(second)
+
+            scorer = self.scorer()
+            for first, seconds in by_first.items():
+                scorer.push(self.drugs[first].targets)
+                for second in seconds:
+                    rows[self.fingerprints[first], self.fingerprints[second]] = (
+                        scorer.baseline_distance
+                        - scorer.distance_after_effects(self.drugs[second].targets)
+                    )
+                scorer.pop()
+            self._store("pair", self.state_key(), rows)
+        self._count("computed", "pair", len(missing))
+        self._count("hits", "pair", len(pairs) - len(missing))
+
+        matrix = np.diag(single)
+        for (a, b), (first, second) in pairs.items():
+            matrix[a, b] = matrix[b, a] = rows[self.fingerprints[first], self.fingerprints[second]]
+        return matrix
+
+    @profiled
+    def synergy_matrix(self):
+        """
+        Pair recovery minus the better single recovery, zero diagonal:
+        the synergy_matrix QuantumDrugOptimizer.build_problem takes.
+
+        Returns: (single recoveries, synergy matrix), panel order
+        """
+        key = content_hash("synergy", self.state_key(), self.fingerprints)
+
+        def compute():
+            pairs = self.pair_scores()
+            single = np.diag(pairs).copy()
+            synergy = pairs - np.maximum.outer(single, single)
+            np.fill_diagonal(synergy, 0.0)
+            return single, synergy
+
+        return self._stage("synergy", key, compute)
+
+    def _rows(self, stage):
+        """
+        Row table {fingerprint key: score} for the current disease state.
+        """
+        if (stage, "rows") not in self._memo:
+            self._memo[stage, "rows"] = self._load(stage, self.state_key(), default={})
+        return self._memo[stage, "rows"]
@@ -11,8 +11,12 @@ N = df["N"]
 # ---------------------------
 plt.figure()
 plt.plot(N, df["ExactTime"], marker="o", label="Exact Solver")
-plt.plot(N, [0]*len(N), marker="x", label="Greedy (≈0)")
-plt.plot(N, [0]*len(N), marker="^", label="Random (≈0)")
+
+# Older result files have no heuristic timings
+if "GreedyTime" in df:
+    plt.plot(N, df["GreedyTime"], marker="x", label="Greedy")
+if "RandomTime" in df:
+    plt.plot(N, df["RandomTime"], marker="^", label="Random")
 
 plt.yscale("log")
 plt.xlabel("Number of Drugs (N)")
@@ -20,7 +24,7 @@ plt.ylabel("Runtime (seconds, log scale)")
 plt.title("Runtime Scaling for k = 4 Drug Selection")
 plt.legend()
 plt.grid(True)
-plt.savefig("fig_runtime.png", dpi=300)
+plt.savefig("figures/fig_runtime.png", dpi=300)
 
 # ---------------------------
 # Optimality Gap Plot
@@ -37,6 +41,6 @@ plt.ylabel("Optimality Gap (Exact − Heuristic)")
 plt.title("Solution Quality Gap for k = 4 Drug Selection")
 plt.legend()
 plt.grid(True)
-plt.savefig("fig_quality.png", dpi=300)
+plt.savefig("figures/fig_quality.png", dpi=300)
 
-print("Saved: fig_runtime.png, fig_quality.png")
+print("Saved: figures/fig_runtime.png, figures/fig_quality.png")
@@ -1,168 +1,387 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import threading
 import time
-import random
+
 import numpy as np
+import psutil
 
-from core.quantum.qaoa_optimizer import QuantumDrugOptimizer
+from core.quantum.qaoa_optimizer import CLASSICAL_BACKENDS, QuantumDrugOptimizer
+from core.quantum.selection import subset_value
 
 # ---------------------------
 # Configuration
 # ---------------------------
 SIZES = [8, 12, 16, 20, 24]   # Number of drugs
-K = 4                     # Select k drugs (k >= 3 enters hard regime)
+K = [4]                   # Select k drugs (k >= 3 enters hard regime)
+SEEDS = [0, 1, 2]         # Problem instances per (N, k)
 RANDOM_TRIALS = 500     # Random search attempts per N
+OUT_DIR = "experiments/benchmarks"
+
+# Regression thresholds against a baseline run
+TIME_RATIO = 1.5        # flag solvers this many times slower...
+MIN_TIME = 0.01         # ...when the baseline took at least this long (s)
+MEMORY_RATIO = 1.5      # flag solvers allocating this many times more...
+MIN_MEMORY = 1.0        # ...and at least this much more (MiB)
+GAP_TOLERANCE = 1e-6
+
+# Reference optimum for the optimality gap and the Exact* columns of
+# results_k{k}.csv, first one that ran
+EXACT_SOLVERS = ["branch_and_bound", "eigensolver"]
 
 
 # ---------------------------
 # Problem Generator
 # ---------------------------
-def generate_problem(n):
+def generate_problem(n, seed):
     """
     Generate synthetic recovery + synergy landscape
     """
-    recovery = np.random.uniform(0.1, 1.0, n)
-    synergy = np.zeros((n, n))
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            synergy[i][j] = synergy[j][i] = np.random.uniform(0, 0.5)
+    rng = np.random.default_rng([seed, n])
+    recovery = rng.uniform(0.1, 1.0, n)
+    synergy = np.triu(rng.uniform(0, 0.5, (n, n)), 1)
+    synergy += synergy.T
 
     return recovery, synergy
 
 
 # ---------------------------
-# Objective Function
+# Random Solver (k-selection)
 # ---------------------------
-def score_set(choice, recovery, synergy):
+def random_solver(recovery, synergy, k, trials, seed=None):
     """
-    Compute:
-    sum(recovery[i]) + sum(synergy[i][j]) for all i<j in choice
+    Best of `trials` uniformly random k-subsets, scored together.
     """
-    s = 0.0
-
-    for i in choice:
-        s += recovery[i]
+    n = len(recovery)
+    rng = np.random.default_rng(seed)
+    choices = np.argsort(rng.random((trials, n)), axis=1)[:, :k]
 
-    for i in range(len(choice)):
-        for j in range(i + 1, len(choice)):
-            s += synergy[choice[i]][choice[j]]
+    scores = recovery[choices].sum(axis=1)
+    for a in range(k):
+        for b in range(a + 1, k):
+            scores += synergy[choices[:, a], choices[:, b]]
 
-    return s
+    best = int(np.argmax(scores))
+    return choices[best].tolist(), float(scores[best])
 
 
 # ---------------------------
-# Greedy Solver (k-selection)
+# Solver Registry
 # ---------------------------
-def greedy_solver(recovery, synergy, k):
-    n = len(recovery)
-    selected = []
+def _backend(name, max_n=None, seeded=False):
+    def setup(recovery, synergy, k, seed):
+        options = {"seed": seed} if seeded else {}
+        if name in CLASSICAL_BACKENDS:
+            # Straight to the arrays: no problem-building copies of
+            # the n × n synergy matrix inside the timed region
+            backend = CLASSICAL_BACKENDS[name]
+            return lambda: backend(recovery, synergy, k, **options).selected
+
+        # Problem and QuadraticProgram construction stay outside the
+        # timed region, so only the solve is measured
+        optimizer = QuantumDrugOptimizer(name, **options)
+        qp = optimizer.build_problem(
+            drug_names=[f"D{i}" for i in range(len(recovery))],
+            recovery_scores=recovery,
+            synergy_matrix=synergy,
+            k=k
+        ).to_quadratic_program()
+        optimizer.solver  # creates the eigensolver
 
-    # Pick best first drug
-    first = max(range(n), key=lambda i: recovery[i])
-    selected.append(first)
+        def run():
+            result = optimizer.solve(qp)
+            return [i for i, v in enumerate(result.x) if round(v) == 1]
 
-    while len(selected) < k:
-        best = None
-        best_score = -1e9
+        return run
 
-        for j in range(n):
-            if j in selected:
-                continue
+    return {"setup": setup, "max_n": max_n}
 
-            candidate = selected + [j]
-            score = score_set(candidate, recovery, synergy)
 
-            if score > best_score:
-                best_score = score
-                best = j
+def _random_setup(recovery, synergy, k, seed):
+    return lambda: random_solver(recovery, synergy, k, RANDOM_TRIALS, seed)[0]
 
-        selected.append(best)
 
-    return selected
+# name -> {"setup": callable(recovery, synergy, k, seed) -> run(), "max_n"};
+# setup() is untimed, run() returns the selected indices
+SOLVERS = {
+    # 2^n Hamiltonian; N = 24 already needs tens of GB
+    "eigensolver": _backend("eigensolver", max_n=20),
+    "branch_and_bound": _backend("branch_and_bound"),
+    "simulated_annealing": _backend("simulated_annealing", seeded=True),
+    "tabu_search": _backend("tabu_search", seeded=True),
+    # C(n, k) statevector plus a parameter sweep
+    "dicke_qaoa": _backend("dicke_qaoa", max_n=40, seeded=True),
+    # multi-start greedy + 1/2-swap local search
+    "greedy": _backend("greedy"),
+    "random": {"setup": _random_setup, "max_n": None},
+}
 
 
 # ---------------------------
-# Random Solver (k-selection)
+# Measurement
 # ---------------------------
-def random_solver(recovery, synergy, k, trials):
-    n = len(recovery)
-    best_score = -1e9
-    best_choice = None
+class PeakRSS:
+    """
+    Peak resident set size while the block runs, sampled by a thread.
+
+    peak_mb: highest RSS seen (MiB)
+    delta_mb: peak above the RSS at entry (MiB)
+    """
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.process = psutil.Process()
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self.start = self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+        self.peak_mb = self.peak / 2**20
+        self.delta_mb = (self.peak - self.start) / 2**20
+
 
-    for _ in range(trials):
-        choice = random.sample(range(n), k)
-        score = score_set(choice, recovery, synergy)
+def measure(solver, recovery, synergy, k, seed):
+    run = SOLVERS[solver]["setup"](recovery, synergy, k, seed)
 
-        if score > best_score:
-            best_score = score
-            best_choice = choice
+    with PeakRSS() as memory:
+        t0 = time.perf_counter()
+        selected = run()
+        elapsed = time.perf_counter() - t0
 
-    return best_choice, best_score
+    return {
+        "value": subset_value(selected, recovery, synergy),
+        "time": elapsed,
+        "peak_rss_mb": memory.peak_mb,
+        "rss_delta_mb": memory.delta_mb,
+        "selected": sorted(int(i) for i in selected),
+    }
 
 
 # ---------------------------
 # Benchmark Runner
 # ---------------------------
-def run_benchmark():
-    print("\n=== Scaling Benchmark (k = {}) ===".format(K))
-    results = []
+def run_benchmark(sizes=SIZES, ks=K, seeds=SEEDS, solvers=None):
+    """
+    Run every solver on every (N, k, seed) instance it accepts.
 
-    for n in SIZES:
-        print(f"\n--- Benchmark N = {n} drugs ---")
-        recovery, synergy = generate_problem(n)
-        drug_names = [f"D{i}" for i in range(n)]
+    Returns: list of records, one per solver run, with the optimality
+             gap against the first EXACT_SOLVERS entry that ran (or the
+             best value found when none did)
+    """
+    solvers = list(solvers or SOLVERS)
+    records = []
+
+    for k in ks:
+        print("\n=== Scaling Benchmark (k = {}) ===".format(k))
+
+        # Untimed warm-up so lazy imports are not billed to the first N
+        recovery, synergy = generate_problem(k + 4, 0)
+        for name in solvers:
+            SOLVERS[name]["setup"](recovery, synergy, k, 0)()
+
+        for n in sizes:
+            print(f"\n--- Benchmark N = {n} drugs ---")
+
+            for seed in seeds:
+                recovery, synergy = generate_problem(n, seed)
+                runs = {}
+
+                for name in solvers:
+                    max_n = SOLVERS[name]["max_n"]
+                    if max_n is not None and n > max_n:
+                        continue
+                    runs[name] = measure(name, recovery, synergy, k, seed)
+
+                reference = next((s for s in EXACT_SOLVERS if s in runs), None)
+                optimum = (
+                    runs[reference]["value"] if reference
+                    else max(run["value"] for run in runs.values())
+                )
+
+                for name, run in runs.items():
+                    run.update({
+                        "solver": name, "N": n, "k": k, "seed": seed,
+                        "gap": optimum - run["value"],
+                        "reference": reference or "best_found",
+                    })
+                    records.append(run)
+                    print(
+                        f"{name:<20}| seed={seed} | value={run['value']:.3f} "
+                        f"| gap={run['gap']:.3f} | time={run['time']:.4f}s "
+                        f"| peak RSS={run['peak_rss_mb']:.0f} MiB"
+                    )
+
+    return records
 
-        # -------------------
-        # Exact Solver (Hamiltonian Baseline)
-        # -------------------
-        optimizer = QuantumDrugOptimizer()
-        qp = optimizer.build_problem(
-            drug_names=drug_names,
-            recovery_scores=recovery.tolist(),
-            synergy_matrix=synergy.tolist(),
-            k=K
-        )
-
-        t0 = time.time()
-        result = optimizer.solve(qp)
-        exact_time = time.time() - t0
-        exact_value = result.fval
-
-        # -------------------
-        # Greedy Solver
-        # -------------------
-        t0 = time.time()
-        gsel = greedy_solver(recovery, synergy, K)
-        greedy_value = score_set(gsel, recovery, synergy)
-        greedy_time = time.time() - t0
-
-        # -------------------
-        # Random Solver
-        # -------------------
-        t0 = time.time()
-        rsel, random_value = random_solver(
-            recovery, synergy, K, RANDOM_TRIALS
-        )
-        random_time = time.time() - t0
-
-        print(f"Exact   | value={exact_value:.3f} | time={exact_time:.4f}s")
-        print(f"Greedy | value={greedy_value:.3f} | time={greedy_time:.4f}s")
-        print(f"Random | value={random_value:.3f} | time={random_time:.4f}s")
-
-        results.append({
-            "N": n,
-            "ExactValue": exact_value,
-            "ExactTime": exact_time,
-            "GreedyValue": greedy_value,
-            "GreedyTime": greedy_time,
-            "RandomValue": random_value,
-            "RandomTime": random_time
-        })
-
-    return results
+
+# ---------------------------
+# Output
+# ---------------------------
+def summarize(records):
+    """
+    (solver, N, k) -> median time, mean value / gap, max peak RSS and
+    max RSS growth during the solve (rss_delta_mb) over seeds.
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault((record["solver"], record["N"], record["k"]), []).append(record)
+
+    return {
+        key: {
+            "time": statistics.median(r["time"] for r in group),
+            "value": statistics.fmean(r["value"] for r in group),
+            "gap": statistics.fmean(r["gap"] for r in group),
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in group),
+            "rss_delta_mb": max(r["rss_delta_mb"] for r in group),
+            "runs": len(group),
+        }
+        for key, group in groups.items()
+    }
+
+
+def write_results(records, out_dir=OUT_DIR, config=None):
+    """
+    Writes
+    - benchmark_results.json: config, environment and every record
+    - benchmark_results.csv: the records, one row per run
+    - results_k{k}.csv: per-N means in the columns plot_scaling.py reads
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    payload = {
+        "config": config or {},
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "records": records,
+    }
+    with open(os.path.join(out_dir, "benchmark_results.json"), "w") as f:
+        json.dump(payload, f, indent=2)
+
+    fields = ["solver", "N", "k", "seed", "value", "gap", "reference",
+              "time", "peak_rss_mb", "rss_delta_mb"]
+    with open(os.path.join(out_dir, "benchmark_results.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+    summary = summarize(records)
+
+    for k in sorted({key[2] for key in summary}):
+        rows = []
+        for n in sorted({key[1] for key in summary if key[2] == k}):
+            exact = next((s for s in EXACT_SOLVERS if (s, n, k) in summary), None)
+            columns = {"Exact": exact, "Greedy": "greedy", "Random": "random"}
+
+            row = {"N": n}
+            for prefix, solver in columns.items():
+                entry = summary.get((solver, n, k))
+                row[f"{prefix}Value"] = "" if entry is None else f"{entry['value']:.3f}"
+                row[f"{prefix}Time"] = "" if entry is None else f"{entry['time']:.4f}"
+            rows.append(row)
+
+        fieldnames = ["N", "ExactValue", "ExactTime", "GreedyValue", "RandomValue",
+                      "GreedyTime", "RandomTime"]
+        with open(os.path.join(out_dir, f"results_k{k}.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+# ---------------------------
+# Baseline Comparison
+# ---------------------------
+def compare_to_baseline(records, baseline_path, time_ratio=TIME_RATIO,
+                        min_time=MIN_TIME, memory_ratio=MEMORY_RATIO,
+                        min_memory=MIN_MEMORY, gap_tolerance=GAP_TOLERANCE):
+    """
+    Regressions of this run against a stored benchmark_results.json,
+    matched by (solver, N, k):
+    - median time up by more than time_ratio (baseline >= min_time)
+    - RSS growth during the solve (rss_delta_mb) up by more than
+      memory_ratio and by at least min_memory MiB; absolute peak RSS
+      is dominated by imports and earlier runs, so it is not compared
+    - mean optimality gap up by more than gap_tolerance
+
+    Returns: list of {"solver", "N", "k", "metric", "baseline", "current"}
+    """
+    with open(baseline_path) as f:
+        baseline = summarize(json.load(f)["records"])
+    current = summarize(records)
+
+    regressions = []
+    for key, now in sorted(current.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+
+        checks = [
+            ("time", before["time"] >= min_time
+             and now["time"] > time_ratio * before["time"]),
+            ("rss_delta_mb", now["rss_delta_mb"] > memory_ratio * before["rss_delta_mb"]
+             and now["rss_delta_mb"] - before["rss_delta_mb"] >= min_memory),
+            ("gap", now["gap"] > before["gap"] + gap_tolerance),
+        ]
+        for metric, regressed in checks:
+            if regressed:
+                solver, n, k = key
+                regressions.append({
+                    "solver": solver, "N": n, "k": k, "metric": metric,
+                    "baseline": before[metric], "current": now[metric],
+                })
+
+    return regressions
 
 
 # ---------------------------
 # Entry Point
 # ---------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for k-drug selection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--k", type=int, nargs="+", default=K)
+    parser.add_argument("--seeds", type=int, nargs="+", default=SEEDS)
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=None)
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    parser.add_argument("--baseline", help="benchmark_results.json to compare against")
+    parser.add_argument("--time-ratio", type=float, default=TIME_RATIO)
+    args = parser.parse_args()
+
+    records = run_benchmark(args.sizes, args.k, args.seeds, args.solvers)
+    config = {"sizes": args.sizes, "k": args.k, "seeds": args.seeds,
+              "solvers": args.solvers or list(SOLVERS)}
+    write_results(records, args.out_dir, config)
+    print(f"\nSaved: {args.out_dir}/benchmark_results.json, benchmark_results.csv, results_k*.csv")
+
+    if args.baseline:
+        regressions = compare_to_baseline(records, args.baseline, time_ratio=args.time_ratio)
+        print(f"\n=== Regressions vs {args.baseline}: {len(regressions)} ===")
+        for r in regressions:
+            print(
+                f"{r['solver']:<20}| N={r['N']} k={r['k']} | {r['metric']}: "
+                f"{r['baseline']:.4g} -> {r['current']:.4g}"
+            )
+        if regressions:
+            raise SystemExit(1)
+
+
 if __name__ == "__main__":
-    run_benchmark()
+    main()
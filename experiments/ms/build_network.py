@@ -1,8 +1,10 @@
+import os
+
 from core.biology.ppi_network import PPINetworkBuilder
-from core.biology.disease_state import DiseaseStateModel
-from core.biology.system_distance import system_distance
+from core.biology.interaction_cache import InteractionCache
 from core.chemistry.drug_effects import DrugModel
 from core.probability.bayesian_success import BayesianSuccessModel
+from core.screening.pipeline import ScreeningPipeline
 
 import pandas as pd
 
@@ -19,24 +21,11 @@ MS_PROTEINS = [
     "VCAM1"
 ]
 
-builder = PPINetworkBuilder()
-graph = builder.build_graph(MS_PROTEINS)
-
-print("Nodes:", graph.number_of_nodes())
-print("Edges:", graph.number_of_edges())
-
-print("\nSample interactions:")
-for u, v, data in list(graph.edges(data=True))[:10]:
-    print(f"{u} ↔ {v} | confidence={data['weight']:.3f}")
-
-model = DiseaseStateModel()
-expr = model.load_expression_data("data/ms_expression.csv")
-
-healthy, diseased = model.build_state_vector(graph, expr)
-
-distance = system_distance(healthy, diseased, graph)
-
-print("\nSystem Disease Distance Score:", round(distance, 4))
+builder = PPINetworkBuilder(
+    cache=InteractionCache(),
+    offline=os.environ.get("QBIO_OFFLINE") == "1",
+    local_dump=os.environ.get("QBIO_STRING_DUMP")
+)
 
 fingolimod = DrugModel(
     name="Fingolimod",
@@ -49,17 +38,26 @@ fingolimod = DrugModel(
     }
 )
 
-post_drug = fingolimod.apply(diseased)
+pipeline = ScreeningPipeline(builder, MS_PROTEINS, "data/ms_expression.csv", [fingolimod])
+graph = pipeline.network()
 
-recovery_score = (
-    system_distance(healthy, diseased, graph)
-    - system_distance(healthy, post_drug, graph)
-)
+print("Nodes:", graph.number_of_nodes())
+print("Edges:", graph.number_of_edges())
+
+print("\nSample interactions:")
+for u, v, data in list(graph.edges(data=True))[:10]:
+    print(f"{u} ↔ {v} | confidence={data['weight']:.3f}")
+
+distance = pipeline.baseline_distance()
+
+print("\nSystem Disease Distance Score:", round(distance, 4))
+
+recovery_score = pipeline.single_scores()[0]
 
 print("\nDrug:", fingolimod.name)
 print("Recovery Score:", round(recovery_score, 4))
 
-bayes = BayesianSuccessModel(prior_success=2, prior_failure=2)
+bayes = BayesianSuccessModel(prior_success=2, prior_failure=2, seed=0)
 
 alpha, beta_param = bayes.update(recovery_score, trials=30, noise=0.1)
 prob = bayes.probability(alpha, beta_param)
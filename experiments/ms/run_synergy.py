@@ -1,10 +1,10 @@
-import itertools
+import os
 
 from core.biology.ppi_network import PPINetworkBuilder
-from core.biology.disease_state import DiseaseStateModel
-from core.biology.system_distance import system_distance
+from core.biology.interaction_cache import InteractionCache
 from core.chemistry.drug_effects import DrugModel
 from core.probability.bayesian_success import BayesianSuccessModel
+from core.screening.pipeline import ScreeningPipeline
 
 # ---------------------------
 # 1. MS Protein Set
@@ -67,51 +67,38 @@ DRUG_PANEL = [
 # 3. Build System
 # ---------------------------
 print("\nBuilding MS System...")
-builder = PPINetworkBuilder(score_threshold=0.7)
-graph = builder.build_graph(MS_PROTEINS)
+builder = PPINetworkBuilder(
+    score_threshold=0.7,
+    cache=InteractionCache(),
+    offline=os.environ.get("QBIO_OFFLINE") == "1",
+    local_dump=os.environ.get("QBIO_STRING_DUMP")
+)
+pipeline = ScreeningPipeline(builder, MS_PROTEINS, "data/ms_expression.csv", DRUG_PANEL)
 
-model = DiseaseStateModel()
-expr = model.load_expression_data("data/ms_expression.csv")
-
-healthy, diseased = model.build_state_vector(graph, expr)
-baseline_distance = system_distance(healthy, diseased, graph)
-
-bayes = BayesianSuccessModel(prior_success=2, prior_failure=2)
+bayes = BayesianSuccessModel(prior_success=2, prior_failure=2, seed=0)
 
 # ---------------------------
-# 4. Single Drug Baselines
+# 4. Screen Pairs
 # ---------------------------
-single_results = {}
+# Memoized per pair: adding a drug only scores its own pairs
+pair_recovery = pipeline.pair_scores()
+_, synergy_matrix = pipeline.synergy_matrix()
 
-for drug in DRUG_PANEL:
-    post_state = drug.apply(diseased)
-    post_distance = system_distance(healthy, post_state, graph)
-    recovery = baseline_distance - post_distance
-    single_results[drug.name] = recovery
+pairs = [
+    (i, j) for i in range(len(DRUG_PANEL)) for j in range(i + 1, len(DRUG_PANEL))
+]
+pairs.sort(key=lambda ij: pair_recovery[ij], reverse=True)
 
-# ---------------------------
-# 5. Test Pairs
-# ---------------------------
 results = []
 
-for drug_a, drug_b in itertools.combinations(DRUG_PANEL, 2):
-    combo_name = f"{drug_a.name} + {drug_b.name}"
-
-    # Apply both drugs sequentially
-    state_after_a = drug_a.apply(diseased)
-    combo_state = drug_b.apply(state_after_a)
-
-    post_distance = system_distance(healthy, combo_state, graph)
-    combo_recovery = baseline_distance - post_distance
-
-    best_single = max(
-        single_results[drug_a.name],
-        single_results[drug_b.name]
-    )
-
-    synergy = combo_recovery - best_single
+for i, j in pairs:
+    drugs = (DRUG_PANEL[i].name, DRUG_PANEL[j].name)
+    combo_name = " + ".join(drugs)
+    combo_recovery = pair_recovery[i, j]
+    synergy = synergy_matrix[i, j]
 
-    alpha, beta_param = bayes.update(
+    # Noise stream keyed by the combination, independent of screen order
+    alpha, beta_param = bayes.for_key(*drugs).update(
         recovery_score=combo_recovery,
         trials=50,
         noise=0.1
@@ -128,7 +115,7 @@ for drug_a, drug_b in itertools.combinations(DRUG_PANEL, 2):
     })
 
 # ---------------------------
-# 6. Rank by Synergy
+# 5. Rank by Synergy
 # ---------------------------
 results = sorted(results, key=lambda x: x["Synergy"], reverse=True)
 
@@ -1,8 +1,10 @@
+import os
+
 from core.biology.ppi_network import PPINetworkBuilder
-from core.biology.disease_state import DiseaseStateModel
-from core.biology.system_distance import system_distance
+from core.biology.interaction_cache import InteractionCache
 from core.chemistry.drug_effects import DrugModel
 from core.probability.bayesian_success import BayesianSuccessModel
+from core.screening.pipeline import ScreeningPipeline
 
 # ---------------------------
 # 1. MS Protein Set
@@ -65,29 +67,26 @@ DRUG_PANEL = [
 # 3. Build System
 # ---------------------------
 print("\nBuilding MS System...")
-builder = PPINetworkBuilder(score_threshold=0.7)
-graph = builder.build_graph(MS_PROTEINS)
-
-model = DiseaseStateModel()
-expr = model.load_expression_data("data/ms_expression.csv")
-
-healthy, diseased = model.build_state_vector(graph, expr)
-baseline_distance = system_distance(healthy, diseased, graph)
+builder = PPINetworkBuilder(
+    score_threshold=0.7,
+    cache=InteractionCache(),
+    offline=os.environ.get("QBIO_OFFLINE") == "1",
+    local_dump=os.environ.get("QBIO_STRING_DUMP")
+)
+pipeline = ScreeningPipeline(builder, MS_PROTEINS, "data/ms_expression.csv", DRUG_PANEL)
 
-bayes = BayesianSuccessModel(prior_success=2, prior_failure=2)
+bayes = BayesianSuccessModel(prior_success=2, prior_failure=2, seed=0)
 
 # ---------------------------
 # 4. Screen Drugs
 # ---------------------------
-results = []
-
-for drug in DRUG_PANEL:
-    post_state = drug.apply(diseased)
-    post_distance = system_distance(healthy, post_state, graph)
+# Memoized per drug: only new or edited drugs are re-scored
+recovery_scores = pipeline.single_scores()
 
-    recovery_score = baseline_distance - post_distance
+results = []
 
-    alpha, beta_param = bayes.update(
+for drug, recovery_score in zip(DRUG_PANEL, recovery_scores):
+    alpha, beta_param = bayes.for_key(drug.name).update(
         recovery_score=recovery_score,
         trials=50,
         noise=0.1
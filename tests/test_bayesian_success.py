@@ -0,0 +1,39 @@
+import numpy as np
+
+from core.probability.bayesian_success import BayesianSuccessModel
+
+
+def test_fixed_seed_is_reproducible():
+    a = BayesianSuccessModel(seed=7).update_batch(np.linspace(0, 1, 20))
+    b = BayesianSuccessModel(seed=7).update_batch(np.linspace(0, 1, 20))
+    np.testing.assert_array_equal(a[0], b[0])
+    np.testing.assert_array_equal(a[1], b[1])
+
+
+def test_for_key_depends_only_on_seed_and_key():
+    first = BayesianSuccessModel(seed=3)
+    first.rng.random(100)
+
+    a = first.for_key("TNF", "IL6").rng.random(5)
+    b = BayesianSuccessModel(seed=3).for_key("TNF", "IL6").rng.random(5)
+    np.testing.assert_array_equal(a, b)
+
+
+def test_keyed_streams_are_distinct():
+    model = BayesianSuccessModel(seed=0)
+    streams = [model.for_key(i).rng.random(4) for i in range(8)]
+    streams += [child.rng.random(4) for child in model.spawn(8)]
+    streams += [model.for_key(str(i)).rng.random(4) for i in range(8)]
+    streams.append(model.for_key("TNF", "IL6").rng.random(4))
+    streams.append(model.for_key("IL6", "TNF").rng.random(4))
+
+    assert len({tuple(s) for s in streams}) == len(streams)
+
+
+def test_spawned_children_key_independently():
+    child = BayesianSuccessModel(seed=0).spawn(2)[1]
+    np.testing.assert_array_equal(
+        child.for_key(5).rng.random(3),
+        BayesianSuccessModel(seed=0).spawn(2)[1].for_key(5).rng.random(3),
+    )
+    assert not np.array_equal(child.for_key(0).rng.random(3), child.spawn(1)[0].rng.random(3))
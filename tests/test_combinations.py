@@ -0,0 +1,105 @@
+import itertools
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from core.biology.system_distance import system_distance
+from core.chemistry.drug_effects import DrugModel
+from core.screening.combinations import CombinationScreen, _suffix_top_sums
+
+
+def _instance(seed, n_nodes=30, n_drugs=9):
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(n_nodes, 70, seed=seed)
+    graph = nx.relabel_nodes(graph, {i: f"P{i}" for i in graph.nodes()})
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = float(rng.uniform(0.4, 1.0))
+
+    nodes = list(graph.nodes())
+    healthy = {p: float(rng.uniform(0.5, 1.5)) for p in nodes}
+    disease = {p: healthy[p] * float(rng.uniform(0.3, 3.0)) for p in nodes}
+
+    drugs = []
+    for d in range(n_drugs):
+        targets = rng.choice(nodes, size=int(rng.integers(1, 4)), replace=False)
+        drugs.append(DrugModel(
+            f"D{d}", {str(p): float(rng.uniform(0.2, 1.8)) for p in targets}
+        ))
+    return graph, healthy, disease, drugs
+
+
+def _brute_force(graph, healthy, disease, drugs, k):
+    """
+    {sorted drug names: recovery} for every k-combination, by applying
+    the drugs one after another and recomputing the full distance.
+    """
+    baseline = system_distance(healthy, disease, graph)
+    scores = {}
+    for combo in itertools.combinations(drugs, k):
+        state = disease
+        for drug in combo:
+            state = drug.apply(state)
+        scores[tuple(d.name for d in combo)] = baseline - system_distance(healthy, state, graph)
+    return scores
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_exhaustive_screen_matches_brute_force(seed, k):
+    graph, healthy, disease, drugs = _instance(seed)
+    expected = _brute_force(graph, healthy, disease, drugs, k)
+
+    results = CombinationScreen(graph, healthy, disease, drugs).screen(
+        k=k, top_n=None, prune=False
+    )
+
+    assert len(results) == len(expected)
+    for row in results:
+        assert row["recovery"] == pytest.approx(expected[row["drugs"]], abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("k", [2, 3])
+@pytest.mark.parametrize("top_n", [1, 5])
+def test_pruned_top_n_matches_brute_force(seed, k, top_n):
+    graph, healthy, disease, drugs = _instance(seed)
+    expected = sorted(_brute_force(graph, healthy, disease, drugs, k).values(), reverse=True)
+
+    screen = CombinationScreen(graph, healthy, disease, drugs)
+    results = screen.screen(k=k, top_n=top_n, prune=True)
+
+    np.testing.assert_allclose(
+        [row["recovery"] for row in results], expected[:top_n], atol=1e-12
+    )
+
+
+def test_min_recovery_filter_matches_brute_force():
+    graph, healthy, disease, drugs = _instance(7)
+    scores = _brute_force(graph, healthy, disease, drugs, 2)
+    cutoff = float(np.median(list(scores.values())))
+
+    results = CombinationScreen(graph, healthy, disease, drugs).screen(
+        k=2, top_n=None, min_recovery=cutoff
+    )
+
+    assert {row["drugs"] for row in results} == {c for c, s in scores.items() if s >= cutoff}
+
+
+def test_synergy_is_recovery_minus_best_single():
+    graph, healthy, disease, drugs = _instance(1)
+    singles = _brute_force(graph, healthy, disease, drugs, 1)
+
+    for row in CombinationScreen(graph, healthy, disease, drugs).screen(k=2, top_n=None):
+        best = max(singles[(name,)] for name in row["drugs"])
+        assert row["synergy"] == pytest.approx(row["recovery"] - best, abs=1e-12)
+
+
+@pytest.mark.parametrize("m", [1, 2, 3])
+def test_suffix_top_sums(m):
+    values = np.random.default_rng(m).uniform(-1, 1, 12)
+    expected = [
+        np.sort(values[i + 1:])[-m:].sum() if len(values) - i - 1 >= m else -np.inf
+        for i in range(len(values))
+    ]
+    np.testing.assert_allclose(_suffix_top_sums(values, m), expected)
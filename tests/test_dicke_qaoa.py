@@ -0,0 +1,103 @@
+import itertools
+from functools import reduce
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+
+from core.quantum.dicke_qaoa import DickeQAOA, colex_rank, dicke_qaoa, subset_states
+from core.quantum.selection import subset_value
+
+X = np.array([[0, 1], [1, 0]], dtype=np.complex128)
+Y = np.array([[0, -1j], [1j, 0]], dtype=np.complex128)
+I2 = np.eye(2, dtype=np.complex128)
+
+
+def _instance(n, seed):
+    rng = np.random.default_rng([seed, n])
+    recovery = rng.uniform(0.1, 1.0, n)
+    synergy = np.triu(rng.uniform(-0.3, 0.5, (n, n)), 1)
+    return recovery, synergy + synergy.T
+
+
+def _two_qubit(n, i, j, a, b):
+    """
+    a on qubit i, b on qubit j over the full 2^n space; qubit q is bit q
+    of the basis index, so qubit 0 is the rightmost Kronecker factor.
+    """
+    factors = [a if q == i else b if q == j else I2 for q in range(n)]
+    return reduce(np.kron, reversed(factors))
+
+
+def _full_statevector(recovery, synergy, k, gammas, betas):
+    """
+    The same circuit on all 2^n basis states: Hamming-weight-k uniform
+    start, diagonal phase, and exp(-i beta (XX + YY) / 2) per ring edge.
+    """
+    n = len(recovery)
+    bits = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1
+    values = bits @ recovery + np.einsum("si,ij,sj->s", bits, np.triu(synergy, 1), bits)
+
+    psi = np.where(bits.sum(axis=1) == k, 1.0, 0.0).astype(np.complex128)
+    psi /= np.linalg.norm(psi)
+
+    for gamma, beta in zip(gammas, betas):
+        psi = np.exp(1j * gamma * values) * psi
+        for i in range(n):
+            j = (i + 1) % n
+            hopping = (_two_qubit(n, i, j, X, X) + _two_qubit(n, i, j, Y, Y)) / 2
+            psi = expm(-1j * beta * hopping) @ psi
+
+    return psi, bits
+
+
+@pytest.mark.parametrize("n, k", [(4, 2), (5, 2), (6, 3), (6, 1)])
+@pytest.mark.parametrize("p", [1, 2])
+def test_matches_full_statevector(n, k, p):
+    recovery, synergy = _instance(n, n * 10 + k)
+    rng = np.random.default_rng(p)
+    gammas, betas = rng.uniform(0, np.pi, p), rng.uniform(0, np.pi, p)
+
+    qaoa = DickeQAOA(recovery, synergy, k)
+    full, bits = _full_statevector(recovery, synergy, k, gammas, betas)
+
+    index = (1 << qaoa.states).sum(axis=1)
+    np.testing.assert_allclose(qaoa.statevector(gammas, betas), full[index], atol=1e-10)
+
+    outside = bits.sum(axis=1) != k
+    np.testing.assert_allclose(full[outside], 0.0, atol=1e-12)
+    assert qaoa.probabilities(gammas, betas).sum() == pytest.approx(1.0)
+
+
+def test_subset_states_and_rank():
+    states = subset_states(6, 3)
+    assert [tuple(s) for s in states] == list(itertools.combinations(range(6), 3))
+    assert sorted(colex_rank(states)) == list(range(len(states)))
+
+
+def test_values_match_subset_value():
+    recovery, synergy = _instance(7, 0)
+    qaoa = DickeQAOA(recovery, synergy, 3)
+
+    expected = [subset_value(s, recovery, synergy) for s in qaoa.states]
+    np.testing.assert_allclose(qaoa.values, expected, atol=1e-12)
+    assert qaoa.best_value == pytest.approx(max(expected))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_backend_returns_k_subset(seed):
+    recovery, synergy = _instance(8, seed)
+
+    result = dicke_qaoa(recovery, synergy, 3, p=2, grid=6, maxiter=40, shots=256, seed=seed)
+
+    assert len(result.selected) == 3 == int(result.x.sum())
+    assert result.fval == pytest.approx(subset_value(result.selected, recovery, synergy))
+    assert result.stats["subspace_size"] == 56
+    assert 0 < result.stats["approximation_ratio"] <= 1 + 1e-12
+
+
+def test_rejects_trivial_k():
+    recovery, synergy = _instance(5, 0)
+    for k in (0, 5):
+        with pytest.raises(ValueError):
+            DickeQAOA(recovery, synergy, k)
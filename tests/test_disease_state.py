@@ -0,0 +1,98 @@
+import importlib.util
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.biology.disease_state import DiseaseStateModel
+
+CSV = """gene,logFC,logFC_b,note
+TNF,1.2,0.4,x
+IFNG,0.9,-0.2,y
+IL6,-0.4,0.1,z
+STAT3,0.7,0.0,w
+TNF,5.0,5.0,duplicate
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "expression.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+def _no_csv_parse(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV parsed")
+
+    monkeypatch.setattr(pd, "read_csv", fail)
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_load_selects_columns_and_genes(csv_path, chunksize):
+    df = DiseaseStateModel().load_expression_data(
+        csv_path, columns=["logFC", "logFC_b"], genes=["TNF", "IL6"], chunksize=chunksize
+    )
+
+    assert list(df.columns) == ["gene", "logFC", "logFC_b"]
+    assert df["gene"].tolist() == ["TNF", "IL6", "TNF"]
+    assert df["logFC_b"].tolist() == [0.4, 0.1, 5.0]
+
+
+def test_npz_cache_is_reused(csv_path, tmp_path, monkeypatch):
+    model = DiseaseStateModel()
+    cache = str(tmp_path / "expr.npz")
+    first = model.load_expression_data(csv_path, genes=["TNF", "IFNG"], cache_path=cache)
+
+    _no_csv_parse(monkeypatch)
+    again = model.load_expression_data(csv_path, genes=["IFNG", "TNF"], cache_path=cache)
+
+    pd.testing.assert_frame_equal(first, again)
+
+
+def test_cache_invalidated_by_selection_and_source(csv_path, tmp_path):
+    model = DiseaseStateModel()
+    cache = str(tmp_path / "expr.npz")
+    model.load_expression_data(csv_path, genes=["TNF"], cache_path=cache)
+
+    other_genes = model.load_expression_data(csv_path, genes=["IL6"], cache_path=cache)
+    assert other_genes["gene"].tolist() == ["IL6"]
+
+    with open(csv_path, "a") as fh:
+        fh.write("IL6,2.5,0.0,later\n")
+    changed = model.load_expression_data(csv_path, genes=["IL6"], cache_path=cache)
+    assert changed["logFC"].tolist() == [-0.4, 2.5]
+
+
+def test_unsupported_cache_format_fails_before_parsing(csv_path, tmp_path, monkeypatch):
+    _no_csv_parse(monkeypatch)
+    with pytest.raises(ValueError, match="Unsupported cache format"):
+        DiseaseStateModel().load_expression_data(csv_path, cache_path=str(tmp_path / "x.csv"))
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_arrow_formats_need_pyarrow(csv_path, tmp_path, monkeypatch, suffix):
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util, "find_spec",
+        lambda name, *args: None if name == "pyarrow" else real_find_spec(name, *args)
+    )
+    _no_csv_parse(monkeypatch)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        DiseaseStateModel().load_expression_data(
+            csv_path, cache_path=str(tmp_path / f"expr{suffix}")
+        )
+
+
+def test_state_vector_uses_first_duplicate_and_neutral_default(csv_path):
+    graph = nx.Graph([("TNF", "IFNG"), ("IFNG", "CD19")])
+    model = DiseaseStateModel()
+    healthy, disease = model.build_state_vector(graph, model.load_expression_data(csv_path))
+
+    assert healthy == {"TNF": 1.0, "IFNG": 1.0, "CD19": 1.0}
+    assert disease["TNF"] == pytest.approx(np.exp(1.2))
+    assert disease["IFNG"] == pytest.approx(np.exp(0.9))
+    assert disease["CD19"] == 1.0
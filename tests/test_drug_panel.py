@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from core.chemistry.drug_effects import DrugModel
+from core.chemistry.drug_panel import DrugPanel
+
+NODES = ["TNF", "IFNG", "IL6", "STAT3", "STAT1", "CD19"]
+DRUGS = [
+    DrugModel("A", {"TNF": 0.6, "IL6": 0.8}),
+    DrugModel("Knockout", {"IFNG": 0.0, "STAT3": 1.4}),
+    DrugModel("C", {"TNF": 0.5, "STAT1": 1.2, "NOT_IN_NETWORK": 0.1}),
+    DrugModel("Empty", {}),
+]
+
+
+def _state(seed=0):
+    rng = np.random.default_rng(seed)
+    return dict(zip(NODES, rng.uniform(0.5, 2.5, len(NODES)).tolist()))
+
+
+def _apply_sequentially(state, drugs):
+    for drug in drugs:
+        state = drug.apply(state)
+    return np.array([state[p] for p in NODES])
+
+
+def test_single_drugs_match_drug_model():
+    panel = DrugPanel(DRUGS, NODES)
+    state = _state()
+    vector = np.array([state[p] for p in NODES])
+
+    expected = np.stack([_apply_sequentially(state, [d]) for d in DRUGS])
+    np.testing.assert_array_equal(panel.apply(vector), expected)
+    np.testing.assert_array_equal(panel.apply(vector, [1, 3]), expected[[1, 3]])
+
+
+def test_knockout_effect_is_kept():
+    panel = DrugPanel(DRUGS, NODES)
+    vector = np.ones(len(NODES))
+
+    after = panel.apply(vector, [1])[0]
+    assert after[NODES.index("IFNG")] == 0.0
+    assert panel.effect_matrix([1])[0, NODES.index("IFNG")] == 0.0
+
+
+@pytest.mark.parametrize("combo", [(0, 2), (2, 0), (0, 1, 2), ("Knockout", "C"), (3, 0), (0, 1, 2, 3)])
+def test_combinations_match_repeated_apply(combo):
+    panel = DrugPanel(DRUGS, NODES)
+    state = _state(1)
+    vector = np.array([state[p] for p in NODES])
+    members = [DRUGS[panel.drug_index[d]] if isinstance(d, str) else DRUGS[d] for d in combo]
+
+    expected = _apply_sequentially(state, members)
+    np.testing.assert_array_equal(panel.apply_combinations(vector, [combo])[0], expected)
+
+
+def test_combinations_over_many_states():
+    panel = DrugPanel(DRUGS, NODES)
+    states = [_state(seed) for seed in range(3)]
+    matrix = np.array([[s[p] for p in NODES] for s in states])
+    combos = [(0, 1), (1, 2), (0, 2, 3)]
+
+    out = panel.apply_combinations(matrix, combos)
+
+    assert out.shape == (len(combos), len(states), len(NODES))
+    for c, combo in enumerate(combos):
+        for s, state in enumerate(states):
+            expected = _apply_sequentially(state, [DRUGS[i] for i in combo])
+            np.testing.assert_array_equal(out[c, s], expected)
@@ -0,0 +1,88 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.quantum.exact_solver import branch_and_bound, top_subsets
+from core.quantum.selection import subset_value
+
+
+def _instance(n, seed, negative=False):
+    rng = np.random.default_rng([seed, n])
+    recovery = rng.uniform(0.1, 1.0, n)
+    low = -0.5 if negative else 0.0
+    synergy = np.triu(rng.uniform(low, 0.5, (n, n)), 1)
+    return recovery, synergy + synergy.T
+
+
+def _all_values(recovery, synergy, k):
+    """
+    [(value, subset)] of every k-subset, best first.
+    """
+    values = [
+        (subset_value(subset, recovery, synergy), subset)
+        for subset in itertools.combinations(range(len(recovery)), k)
+    ]
+    return sorted(values, key=lambda item: (-item[0], item[1]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n, k", [(6, 1), (8, 3), (10, 4), (12, 5), (9, 9)])
+@pytest.mark.parametrize("negative", [False, True])
+def test_branch_and_bound_matches_brute_force(seed, n, k, negative):
+    recovery, synergy = _instance(n, seed, negative)
+    best_value, _ = _all_values(recovery, synergy, k)[0]
+
+    result = branch_and_bound(recovery, synergy, k)
+
+    assert result.status == "OPTIMAL"
+    assert len(result.selected) == k
+    assert result.fval == pytest.approx(best_value, abs=1e-12)
+    assert subset_value(result.selected, recovery, synergy) == pytest.approx(result.fval)
+
+
+def test_branch_and_bound_incumbent_does_not_change_optimum():
+    recovery, synergy = _instance(12, 3)
+    cold = branch_and_bound(recovery, synergy, 4)
+
+    for incumbent in [(0, 1, 2, 3), tuple(cold.selected)]:
+        warm = branch_and_bound(recovery, synergy, 4, incumbent=incumbent)
+        assert warm.fval == pytest.approx(cold.fval, abs=1e-12)
+
+
+def test_branch_and_bound_rejects_bad_input():
+    recovery, synergy = _instance(5, 0)
+    with pytest.raises(ValueError):
+        branch_and_bound(recovery, synergy, 0)
+    with pytest.raises(ValueError):
+        branch_and_bound(recovery, synergy, 2, incumbent=(1, 1))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n, k, m", [(8, 3, 1), (10, 4, 5), (12, 4, 20), (7, 3, 35), (7, 3, 50)])
+@pytest.mark.parametrize("negative", [False, True])
+def test_top_subsets_matches_brute_force(seed, n, k, m, negative):
+    recovery, synergy = _instance(n, seed, negative)
+    expected = _all_values(recovery, synergy, k)[:m]
+
+    results = top_subsets(recovery, synergy, k, m=m)
+
+    assert len(results) == len(expected)
+    assert len({r.selected for r in results}) == len(results)
+    np.testing.assert_allclose(
+        [r.fval for r in results], [value for value, _ in expected], atol=1e-12
+    )
+
+
+def test_top_subsets_with_incumbent():
+    recovery, synergy = _instance(11, 2)
+    ranked = _all_values(recovery, synergy, 3)
+    expected = ranked[:10]
+
+    # The worst subset as incumbent must not displace a true entry
+    incumbent = ranked[-1][1]
+    results = top_subsets(recovery, synergy, 3, m=10, incumbent=incumbent)
+
+    np.testing.assert_allclose(
+        [r.fval for r in results], [value for value, _ in expected], atol=1e-12
+    )
@@ -0,0 +1,97 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.quantum.exact_solver import branch_and_bound
+from core.quantum.heuristic_solvers import greedy_local_search
+from core.quantum.selection import subset_value
+
+
+def _instance(n, seed, negative=True):
+    rng = np.random.default_rng([seed, n])
+    recovery = rng.uniform(0.1, 1.0, n)
+    low = -0.5 if negative else 0.0
+    synergy = np.triu(rng.uniform(low, 0.5, (n, n)), 1)
+    return recovery, synergy + synergy.T
+
+
+def _neighbours(selected, n, size):
+    """
+    Every subset reached by exchanging `size` selected drugs for
+    `size` unselected ones.
+    """
+    outside = sorted(set(range(n)) - set(selected))
+    for leave in itertools.combinations(selected, size):
+        for enter in itertools.combinations(outside, size):
+            yield sorted(set(selected) - set(leave) | set(enter))
+
+
+def _plain_greedy(recovery, synergy, k, first):
+    selected = [first]
+    while len(selected) < k:
+        rest = [j for j in range(len(recovery)) if j not in selected]
+        selected.append(max(rest, key=lambda j: subset_value(selected + [j], recovery, synergy)))
+    return subset_value(selected, recovery, synergy)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n, k", [(8, 3), (10, 4), (12, 5)])
+@pytest.mark.parametrize("swaps", [1, 2])
+def test_result_is_local_optimum(seed, n, k, swaps):
+    recovery, synergy = _instance(n, seed)
+
+    result = greedy_local_search(recovery, synergy, k, swaps=swaps)
+
+    assert len(result.selected) == k
+    assert result.fval == pytest.approx(subset_value(result.selected, recovery, synergy))
+    assert result.fval <= branch_and_bound(recovery, synergy, k).fval + 1e-12
+    for size in range(1, swaps + 1):
+        for other in _neighbours(result.selected, n, size):
+            assert subset_value(other, recovery, synergy) <= result.fval + 1e-12
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n, k", [(6, 2), (9, 2), (9, 7), (10, 8)])
+def test_two_swap_optimum_is_exact_when_neighbourhood_is_complete(seed, n, k):
+    # With min(k, n - k) <= 2 every k-subset is one 2-swap (or 1-swap) away
+    recovery, synergy = _instance(n, seed)
+
+    result = greedy_local_search(recovery, synergy, k, swaps=2)
+
+    assert result.fval == pytest.approx(branch_and_bound(recovery, synergy, k).fval, abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_multi_start_matches_exact_on_small_instances(seed):
+    recovery, synergy = _instance(9, seed, negative=False)
+
+    result = greedy_local_search(recovery, synergy, 4, swaps=2, starts=9)
+
+    assert result.fval == pytest.approx(branch_and_bound(recovery, synergy, 4).fval, abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_greedy_only_is_best_greedy_construction(seed):
+    recovery, synergy = _instance(10, seed)
+    starts = 4
+    firsts = np.argsort(-recovery)[:starts]
+
+    result = greedy_local_search(recovery, synergy, 4, swaps=0, starts=starts)
+
+    expected = max(_plain_greedy(recovery, synergy, 4, int(f)) for f in firsts)
+    assert result.fval == pytest.approx(expected, abs=1e-12)
+    assert result.stats["swaps1"] == result.stats["swaps2"] == 0
+
+
+def test_warm_start_from_optimum_stays_there():
+    recovery, synergy = _instance(12, 0)
+    optimum = branch_and_bound(recovery, synergy, 5)
+
+    result = greedy_local_search(recovery, synergy, 5, start=optimum.selected)
+
+    assert result.selected == optimum.selected
+    assert result.stats["starts"] == 1
+
+    with pytest.raises(ValueError):
+        greedy_local_search(recovery, synergy, 5, start=[0, 1, 2])
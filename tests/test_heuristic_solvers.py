@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from core.quantum.heuristic_solvers import simulated_annealing, tabu_search
+from core.quantum.qaoa_optimizer import QuantumDrugOptimizer
+from core.quantum.selection import subset_value
+
+SOLVERS = [simulated_annealing, tabu_search]
+
+
+def _instance(n, seed):
+    rng = np.random.default_rng([seed, n])
+    recovery = rng.uniform(0.1, 1.0, n)
+    synergy = np.triu(rng.uniform(-0.3, 0.5, (n, n)), 1)
+    return recovery, synergy + synergy.T
+
+
+def _eigensolver_optimum(recovery, synergy, k):
+    optimizer = QuantumDrugOptimizer("eigensolver")
+    qp = optimizer.build_problem([f"D{i}" for i in range(len(recovery))], recovery, synergy, k)
+    return optimizer.solve(qp).fval
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("n, k", [(6, 2), (8, 3), (9, 4)])
+def test_matches_eigensolver_optimum(solver, seed, n, k):
+    recovery, synergy = _instance(n, seed)
+
+    result = solver(recovery, synergy, k, seed=seed)
+
+    assert len(result.selected) == k == int(result.x.sum())
+    assert result.fval == pytest.approx(subset_value(result.selected, recovery, synergy))
+    assert result.fval == pytest.approx(_eigensolver_optimum(recovery, synergy, k), abs=1e-9)
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+def test_seeded_runs_are_reproducible(solver):
+    recovery, synergy = _instance(30, 0)
+    a = solver(recovery, synergy, 5, seed=11)
+    b = solver(recovery, synergy, 5, seed=11)
+    assert a.selected == b.selected and a.fval == b.fval
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+def test_warm_start_and_edge_cases(solver):
+    recovery, synergy = _instance(12, 1)
+    warm = solver(recovery, synergy, 4, seed=0, start=[0, 1, 2, 3])
+    assert len(warm.selected) == 4
+
+    everything = solver(recovery, synergy, 12, seed=0)
+    assert everything.selected == tuple(range(12))
+
+    with pytest.raises(ValueError):
+        solver(recovery, synergy, 0)
+    with pytest.raises(ValueError):
+        solver(recovery, synergy, 3, start=[1, 1, 2])
@@ -0,0 +1,89 @@
+import json
+import os
+import time
+
+from core.biology.interaction_cache import InteractionCache
+
+
+def _age(cache, key, seconds):
+    """
+    Backdate an entry's creation and access time by `seconds`.
+    """
+    path = cache._path(key)
+    with open(path, "r", encoding="utf-8") as fh:
+        entry = json.load(fh)
+
+    entry["created"] = time.time() - seconds
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(entry, fh)
+    os.utime(path, (entry["created"], entry["created"]))
+
+
+def test_key_ignores_protein_order_and_duplicates():
+    a = InteractionCache.key(9606, 0.4, ["TNF", "IL6", "IFNG"])
+    b = InteractionCache.key(9606, 0.4, ["IFNG", "TNF", "IL6", "TNF"])
+    assert a == b
+    assert a != InteractionCache.key(9606, 0.7, ["TNF", "IL6", "IFNG"])
+    assert a != InteractionCache.key(10090, 0.4, ["TNF", "IL6", "IFNG"])
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = InteractionCache(str(tmp_path))
+    cache.put("k", [{"preferredName_A": "TNF", "preferredName_B": "IL6", "score": 0.9}])
+    assert cache.get("k")[0]["score"] == 0.9
+    assert cache.get("missing") is None
+
+
+def test_expired_entries_only_served_on_request(tmp_path):
+    cache = InteractionCache(str(tmp_path), ttl=60)
+    cache.put("old", [1])
+    _age(cache, "old", 3600)
+
+    assert cache.get("old") is None
+    assert cache.get("old", allow_expired=True) == [1]
+
+
+def test_put_keeps_expired_entries_for_offline_use(tmp_path):
+    cache = InteractionCache(str(tmp_path), ttl=60)
+    cache.put("old", [1])
+    _age(cache, "old", 3600)
+
+    cache.put("new", [2])
+    assert cache.get("old", allow_expired=True) == [1]
+
+
+def test_purge_expired(tmp_path):
+    cache = InteractionCache(str(tmp_path), ttl=60)
+    cache.put("old", [1])
+    cache.put("new", [2])
+    _age(cache, "old", 3600)
+
+    assert cache.purge_expired() == 1
+    assert cache.get("old", allow_expired=True) is None
+    assert cache.get("new") == [2]
+
+
+def test_lru_eviction_on_entry_bound(tmp_path):
+    cache = InteractionCache(str(tmp_path), max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    _age(cache, "a", 10)
+    _age(cache, "b", 5)
+
+    # Reading "a" makes "b" the least recently used
+    cache.get("a")
+    cache.put("c", [3])
+
+    assert cache.get("a") == [1]
+    assert cache.get("b") is None
+    assert cache.get("c") == [3]
+
+
+def test_eviction_on_byte_bound(tmp_path):
+    cache = InteractionCache(str(tmp_path), max_entries=None, max_bytes=200)
+    cache.put("a", ["x" * 150])
+    _age(cache, "a", 5)
+    cache.put("b", ["y" * 150])
+
+    assert cache.get("a") is None
+    assert cache.get("b") == ["y" * 150]
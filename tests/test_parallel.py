@@ -0,0 +1,77 @@
+from multiprocessing import shared_memory
+
+import pytest
+
+from core.chemistry.drug_effects import DrugModel
+from core.screening import parallel
+from core.screening.combinations import CombinationScreen
+from core.screening.parallel import ParallelScreen
+from tests.test_combinations import _instance
+
+
+def _segment_names(screen):
+    return [shm.name for shm in screen._segments]
+
+
+def _assert_unlinked(names):
+    assert names
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def _rows(results):
+    return [(row["drugs"], round(row["recovery"], 12)) for row in results]
+
+
+@pytest.mark.parametrize("k, top_n", [(2, 5), (3, 10), (3, None)])
+def test_matches_serial_screen(k, top_n):
+    graph, healthy, disease, drugs = _instance(2)
+    serial = CombinationScreen(graph, healthy, disease, drugs)
+
+    with ParallelScreen(graph, healthy, disease, drugs, max_workers=2) as screen:
+        names = _segment_names(screen)
+        singles = screen.screen_singles()
+        results = screen.screen_combinations(k=k, top_n=top_n)
+
+    assert singles == pytest.approx(
+        dict(zip((d.name for d in drugs), serial.single_recovery)), abs=1e-12
+    )
+    assert _rows(results) == _rows(serial.screen(k=k, top_n=top_n))
+    _assert_unlinked(names)
+
+
+def test_segments_unlinked_when_a_task_fails():
+    graph, healthy, disease, drugs = _instance(0)
+    # Non-numeric effect: fails inside the worker when the drug is scored
+    broken = drugs + [DrugModel("Broken", {"P1": "strong"})]
+
+    with pytest.raises(Exception):
+        with ParallelScreen(graph, healthy, disease, broken, max_workers=2) as screen:
+            names = _segment_names(screen)
+            screen.screen_singles()
+
+    _assert_unlinked(names)
+
+
+def test_segments_unlinked_when_setup_fails(monkeypatch):
+    graph, healthy, disease, drugs = _instance(0)
+    created = []
+    real_shared_memory = shared_memory.SharedMemory
+
+    def recording(*args, **kwargs):
+        shm = real_shared_memory(*args, **kwargs)
+        created.append(shm.name)
+        return shm
+
+    def no_pool(*args, **kwargs):
+        raise OSError("cannot start workers")
+
+    monkeypatch.setattr(parallel.shared_memory, "SharedMemory", recording)
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+
+    with pytest.raises(OSError):
+        ParallelScreen(graph, healthy, disease, drugs, max_workers=2)
+
+    monkeypatch.setattr(parallel.shared_memory, "SharedMemory", real_shared_memory)
+    _assert_unlinked(created)
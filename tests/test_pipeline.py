@@ -0,0 +1,71 @@
+import json
+import os
+
+import numpy as np
+
+from core.biology.interaction_cache import InteractionCache
+from core.biology.ppi_network import PPINetworkBuilder
+from core.chemistry.drug_effects import DrugModel
+from core.screening.pipeline import ScreeningPipeline
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "string_network.json")
+PROTEINS = ["TNF", "IFNG", "IL6", "STAT3", "STAT1"]
+DRUGS = [
+    DrugModel("A", {"TNF": 0.6, "IL6": 0.8}),
+    DrugModel("B", {"IFNG": 0.7}),
+    DrugModel("C", {"STAT3": 0.5, "STAT1": 1.2}),
+]
+
+
+def _expression(tmp_path):
+    path = tmp_path / "expression.csv"
+    path.write_text("gene,logFC\nTNF,1.2\nIFNG,0.9\nIL6,-0.4\nSTAT3,0.7\nSTAT1,0.3\n")
+    return str(path)
+
+
+def _pipeline(tmp_path, dump, drugs=DRUGS):
+    builder = PPINetworkBuilder(
+        cache=InteractionCache(str(tmp_path / "string")), offline=True, local_dump=dump
+    )
+    return ScreeningPipeline(
+        builder, PROTEINS, _expression(tmp_path), drugs, cache_dir=str(tmp_path / "pipeline")
+    )
+
+
+def test_second_run_reuses_every_stage(tmp_path):
+    first = _pipeline(tmp_path, FIXTURE)
+    single, synergy = first.synergy_matrix()
+
+    second = _pipeline(tmp_path, FIXTURE)
+    single_again, synergy_again = second.synergy_matrix()
+
+    np.testing.assert_array_equal(single, single_again)
+    np.testing.assert_array_equal(synergy, synergy_again)
+    assert second.stats["computed"] == {}
+
+
+def test_adding_a_drug_scores_only_its_rows(tmp_path):
+    _pipeline(tmp_path, FIXTURE).pair_scores()
+
+    extra = DRUGS + [DrugModel("D", {"TNF": 0.9, "STAT1": 0.8})]
+    pipeline = _pipeline(tmp_path, FIXTURE, extra)
+    pipeline.pair_scores()
+
+    assert pipeline.stats["computed"] == {"single": 1, "pair": 3}
+
+
+def test_changed_network_source_invalidates_downstream(tmp_path):
+    with open(FIXTURE, "r", encoding="utf-8") as fh:
+        records = json.load(fh)
+    smaller = tmp_path / "smaller.json"
+    smaller.write_text(json.dumps(records[:2]))
+
+    full = _pipeline(tmp_path, FIXTURE)
+    full_edges = full.network().number_of_edges()
+    full_scores = full.single_scores()
+
+    reduced = _pipeline(tmp_path, str(smaller))
+    assert reduced.network().number_of_edges() == 2 < full_edges
+    assert reduced.network_key() != full.network_key()
+    assert not np.allclose(reduced.single_scores(), full_scores)
+    assert reduced.stats["computed"]["single"] == len(DRUGS)
@@ -0,0 +1,190 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+import requests
+
+from core.biology.interaction_cache import InteractionCache
+from core.biology.ppi_network import STRING_IDS_URL, STRING_PARTNERS_URL, PPINetworkBuilder
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "string_network.json")
+
+
+def _records():
+    with open(FIXTURE, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+# Identifiers STRING resolves to another preferred name
+ALIASES = {"TNFA": "TNF", "P01579": "IFNG", "ENSP00000264657": "STAT3"}
+
+
+def _resolve(identifier):
+    """
+    Preferred name STRING maps an identifier to (STRING ids included).
+    """
+    identifier = identifier.split(".", 1)[1] if identifier.startswith("9606.") else identifier
+    return ALIASES.get(identifier, identifier)
+
+
+def _with_ids(record, swap=False):
+    a, b = record["preferredName_A"], record["preferredName_B"]
+    if swap:
+        a, b = b, a
+    return {**record, "preferredName_A": a, "preferredName_B": b,
+            "stringId_A": f"9606.{a}", "stringId_B": f"9606.{b}"}
+
+
+def _mock_session(builder, handler=None):
+    """
+    Replace the builder's requests session with a mock answering from
+    the fixture: every record with both ends among the identifiers
+    (network), every partner of them (interaction_partners) or their
+    STRING ids (get_string_ids).
+    """
+    known = {name for r in _records() for name in (r["preferredName_A"], r["preferredName_B"])}
+
+    def get(url, params=None, **kwargs):
+        queries = params["identifiers"].split("\r")
+        wanted = {_resolve(q) for q in queries}
+        response = mock.Mock()
+        if url == STRING_IDS_URL:
+            response.json.return_value = [
+                {"queryItem": q, "stringId": f"9606.{_resolve(q)}", "preferredName": _resolve(q)}
+                for q in queries if _resolve(q) in known
+            ]
+        elif url == STRING_PARTNERS_URL:
+            # Every partner of every query protein, query first
+            response.json.return_value = [
+                _with_ids(r, swap=r["preferredName_A"] not in wanted)
+                for r in _records()
+                if r["preferredName_A"] in wanted or r["preferredName_B"] in wanted
+            ]
+        else:
+            response.json.return_value = [
+                _with_ids(r) for r in _records()
+                if r["preferredName_A"] in wanted and r["preferredName_B"] in wanted
+            ]
+        return response
+
+    session = mock.Mock()
+    session.get.side_effect = handler or get
+    builder._session = session
+    return session
+
+
+def _edges(graph):
+    return {tuple(sorted(edge)) for edge in graph.edges()}
+
+
+def test_online_fetch_is_cached(tmp_path):
+    cache = InteractionCache(str(tmp_path))
+    builder = PPINetworkBuilder(cache=cache)
+    session = _mock_session(builder)
+
+    proteins = ["TNF", "IFNG", "IL6"]
+    first = builder.build_graph(proteins)
+    second = builder.build_graph(list(reversed(proteins)))
+
+    assert session.get.call_count == 1
+    assert _edges(first) == _edges(second) == {("IFNG", "TNF"), ("IL6", "TNF")}
+
+
+def test_request_parameters():
+    builder = PPINetworkBuilder(species=9606, score_threshold=0.7)
+    session = _mock_session(builder)
+    builder.fetch_interactions(["TNF", "IFNG"])
+
+    params = session.get.call_args.kwargs["params"]
+    assert params["identifiers"] == "TNF\rIFNG"
+    assert params["species"] == 9606
+    assert params["required_score"] == 700
+
+    # requests encodes the carriage return as %0D, the separator STRING expects
+    url = requests.Request("GET", session.get.call_args.args[0], params=params).prepare().url
+    assert "identifiers=TNF%0DIFNG" in url
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+@pytest.mark.parametrize("proteins", [
+    ["TNF", "IFNG", "IL6", "STAT3", "STAT1", "CD19", "IL17A"],
+    # aliases, UniProt and Ensembl ids, plus an unknown identifier
+    ["TNFA", "P01579", "IL6", "ENSP00000264657", "STAT1", "CD19", "IL17A", "NOPE"],
+])
+def test_batched_fetch_matches_single_request(chunk_size, proteins):
+    single = PPINetworkBuilder()
+    _mock_session(single)
+    expected = _edges(single.build_graph(proteins))
+
+    batched = PPINetworkBuilder(chunk_size=chunk_size, max_workers=2)
+    session = _mock_session(batched)
+    graph = batched.build_graph(proteins)
+
+    # id mapping plus partners: two requests per chunk, not one per pair of chunks
+    chunks = -(-len(proteins) // chunk_size)
+    known = -(-(len(proteins) - ("NOPE" in proteins)) // chunk_size)
+    assert session.get.call_count == chunks + known
+    assert _edges(graph) == expected
+    assert ("IFNG", "TNF") in expected
+
+
+def test_batched_fetch_creates_one_session(monkeypatch):
+    created = []
+
+    def make_session():
+        session = mock.Mock()
+        session.get.side_effect = lambda url, params=None, **kwargs: mock.Mock(
+            json=mock.Mock(return_value=[])
+        )
+        created.append(session)
+        return session
+
+    monkeypatch.setattr(requests, "Session", make_session)
+    builder = PPINetworkBuilder(chunk_size=1, max_workers=8)
+    builder.fetch_interactions_batched([f"P{i}" for i in range(32)])
+
+    assert len(created) == 1
+
+
+def test_offline_prefers_cache_even_when_expired(tmp_path):
+    cache = InteractionCache(str(tmp_path), ttl=0)
+    proteins = ["TNF", "IL6"]
+    record = {"preferredName_A": "TNF", "preferredName_B": "IL6", "score": 0.5}
+    cache.put(cache.key(9606, 0.4, proteins), [record])
+
+    builder = PPINetworkBuilder(cache=cache, offline=True, local_dump=FIXTURE)
+    session = _mock_session(builder)
+
+    assert builder.fetch_interactions(proteins) == [record]
+    session.get.assert_not_called()
+
+
+def test_offline_falls_back_to_local_dump(tmp_path):
+    builder = PPINetworkBuilder(
+        score_threshold=0.5, cache=InteractionCache(str(tmp_path)),
+        offline=True, local_dump=FIXTURE
+    )
+    session = _mock_session(builder)
+
+    graph = builder.build_graph(["TNF", "IFNG", "IL6", "STAT3", "IL17A"])
+
+    session.get.assert_not_called()
+    # IL17A–IL6 is below the score threshold; STAT1 is not requested
+    assert _edges(graph) == {("IFNG", "TNF"), ("IL6", "TNF"), ("IL6", "STAT3")}
+
+
+def test_offline_without_data_raises(tmp_path):
+    builder = PPINetworkBuilder(cache=InteractionCache(str(tmp_path)), offline=True)
+    with pytest.raises(RuntimeError):
+        builder.fetch_interactions(["TNF", "IL6"])
+
+
+def test_http_errors_propagate():
+    builder = PPINetworkBuilder()
+    response = mock.Mock()
+    response.raise_for_status.side_effect = RuntimeError("503")
+    _mock_session(builder, handler=lambda url, params=None, **kwargs: response)
+
+    with pytest.raises(RuntimeError):
+        builder.fetch_interactions(["TNF", "IL6"])
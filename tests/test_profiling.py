@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from core import profiling
+
+
+@pytest.fixture
+def profiler_off():
+    yield
+    profiling.disable()
+
+
+def test_disabled_span_is_shared_noop(profiler_off):
+    profiling.disable()
+    assert profiling.span("a") is profiling.span("b")
+
+
+def test_report_counts_spans_without_keeping_events(profiler_off):
+    profiler = profiling.enable(track_memory=False)
+
+    @profiling.profiled
+    def work():
+        return 1
+
+    for _ in range(50):
+        work()
+
+    assert profiler.report()[work.__qualname__]["count"] == 50
+    assert profiler.events == []
+    with pytest.raises(RuntimeError):
+        profiler.to_chrome_trace("unused.json")
+
+
+def test_trace_events_are_capped(profiler_off, tmp_path):
+    profiler = profiling.enable(track_memory=False, trace=True, max_events=10)
+    for _ in range(25):
+        with profiling.span("stage"):
+            pass
+
+    assert profiler.report()["stage"]["count"] == 25
+    assert len(profiler.events) == 10
+    assert profiler.dropped_events == 15
+
+    path = tmp_path / "trace.json"
+    profiler.to_chrome_trace(str(path))
+    trace = json.loads(path.read_text())
+    assert len(trace["traceEvents"]) == 10
+    assert trace["otherData"]["dropped_events"] == 15
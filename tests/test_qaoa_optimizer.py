@@ -0,0 +1,95 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from core.quantum.qaoa_optimizer import QuantumDrugOptimizer
+from core.quantum.selection import subset_value
+
+
+def _instance(n, seed):
+    rng = np.random.default_rng([seed, n])
+    recovery = rng.uniform(0.1, 1.0, n)
+    synergy = np.triu(rng.uniform(-0.3, 0.5, (n, n)), 1)
+    return recovery, synergy + synergy.T
+
+
+def _names(n):
+    return [f"D{i}" for i in range(n)]
+
+
+def test_inputs_are_copied_not_frozen():
+    recovery, synergy = _instance(6, 0)
+    problem = QuantumDrugOptimizer("greedy").build_problem(_names(6), recovery, synergy, k=2)
+
+    assert recovery.flags.writeable and synergy.flags.writeable
+    assert not np.shares_memory(problem.recovery, recovery)
+    assert not problem.recovery.flags.writeable
+    assert not problem.synergy.flags.writeable
+
+    before = problem.recovery.copy(), problem.synergy.copy()
+    recovery[0] += 10.0
+    synergy[0, 1] += 10.0
+    np.testing.assert_array_equal(problem.recovery, before[0])
+    np.testing.assert_array_equal(problem.synergy, before[1])
+
+
+def test_rebuilding_after_caller_edits_sees_new_values():
+    recovery, synergy = _instance(6, 1)
+    optimizer = QuantumDrugOptimizer("greedy")
+    optimizer.build_problem(_names(6), recovery, synergy, k=2)
+
+    recovery[:] = np.arange(6.0)
+    again = optimizer.build_problem(_names(6), recovery, synergy, k=2)
+
+    np.testing.assert_array_equal(again.recovery, np.arange(6.0))
+
+
+def test_with_k_shares_arrays():
+    recovery, synergy = _instance(8, 2)
+    optimizer = QuantumDrugOptimizer("branch_and_bound")
+    problem = optimizer.build_problem(_names(8), recovery, synergy, k=2)
+
+    for k in (1, 3, 5):
+        other = problem.with_k(k)
+        assert other.k == k and problem.k == 2
+        assert other.recovery is problem.recovery and other.synergy is problem.synergy
+        assert other.drug_names == problem.drug_names
+
+        best = max(
+            subset_value(s, recovery, synergy) for s in itertools.combinations(range(8), k)
+        )
+        assert optimizer.solve(other).fval == pytest.approx(best, abs=1e-12)
+
+
+def test_build_qubo_energy_matches_objective():
+    recovery, synergy = _instance(7, 3)
+    qubo = QuantumDrugOptimizer("greedy").build_qubo(recovery, synergy, k=3)
+    Q = qubo.matrix()
+
+    for bits in itertools.product([0, 1], repeat=7):
+        x = np.array(bits, dtype=np.float64)
+        assert qubo.energy(x) == pytest.approx(x @ Q @ x + qubo.offset, abs=1e-9)
+        if x.sum() == 3:
+            value = subset_value(np.flatnonzero(x), recovery, synergy)
+            assert qubo.energy(x) == pytest.approx(-value, abs=1e-9)
+        else:
+            assert qubo.energy(x) > 0
+
+
+def test_tolerance_gives_sparse_synergy():
+    recovery, synergy = _instance(6, 4)
+    qubo = QuantumDrugOptimizer("greedy").build_qubo(recovery, synergy, k=2, tolerance=0.2)
+
+    assert sparse.issparse(qubo.synergy)
+    assert np.all(np.abs(qubo.synergy.data) > 0.2)
+
+
+def test_mismatched_inputs_rejected():
+    recovery, synergy = _instance(6, 5)
+    optimizer = QuantumDrugOptimizer("greedy")
+    with pytest.raises(ValueError):
+        optimizer.build_problem(_names(5), recovery, synergy)
+    with pytest.raises(ValueError):
+        optimizer.build_problem(_names(6), recovery, synergy[:5, :5])
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from core.quantum.exact_solver import branch_and_bound
+from core.quantum.qaoa_optimizer import QuantumDrugOptimizer
+from core.quantum.selection import DrugSelectionProblem, ProblemDiff
+
+NAMES = ["A", "B", "C", "D"]
+RECOVERY = [0.4, 0.3, 0.2, 0.1]
+SYNERGY = [
+    [0.0, 0.1, 0.0, 0.2],
+    [0.1, 0.0, 0.3, 0.0],
+    [0.0, 0.3, 0.0, 0.05],
+    [0.2, 0.0, 0.05, 0.0],
+]
+
+
+def _problem(k=2):
+    return QuantumDrugOptimizer("branch_and_bound").build_problem(NAMES, RECOVERY, SYNERGY, k)
+
+
+def _synergy(problem, a, b):
+    _, synergy, _ = problem.arrays()
+    return synergy[problem.drug_names.index(a), problem.drug_names.index(b)]
+
+
+def test_apply_remove_add_and_update():
+    diff = ProblemDiff(
+        removed=["B"],
+        added={"E": (0.9, {"A": 0.5, "D": -0.1})},
+        recovery={"C": 0.6},
+        synergy={("C", "D"): 0.4},
+        k=3,
+    )
+    problem = diff.apply(_problem())
+    recovery, synergy, k = problem.arrays()
+
+    assert problem.drug_names == ["A", "C", "D", "E"]
+    np.testing.assert_array_equal(recovery, [0.4, 0.6, 0.1, 0.9])
+    np.testing.assert_array_equal(synergy, synergy.T)
+    assert _synergy(problem, "A", "D") == 0.2
+    assert _synergy(problem, "E", "A") == 0.5
+    assert _synergy(problem, "D", "E") == -0.1
+    assert _synergy(problem, "C", "D") == 0.4
+    assert _synergy(problem, "C", "E") == 0.0
+    assert k == 3
+
+
+def test_apply_leaves_original_unchanged():
+    problem = _problem()
+    before = problem.arrays()
+
+    ProblemDiff(recovery={"A": 5.0}, synergy={("A", "B"): 5.0}).apply(problem)
+
+    for old, new in zip(before, problem.arrays()):
+        np.testing.assert_array_equal(old, new)
+
+
+@pytest.mark.parametrize("diff, message", [
+    (ProblemDiff(removed=["A"], added={"E": (0.9, {"A": 0.5})}), "'A' \\(removed\\)"),
+    (ProblemDiff(added={"E": (0.9, {"Z": 0.5})}), "'Z' \\(not in problem\\)"),
+    (ProblemDiff(removed=["A"], recovery={"A": 0.5}), "Recovery update.*'A' \\(removed\\)"),
+    (ProblemDiff(recovery={"Z": 0.5}), "Recovery update.*'Z'"),
+    (ProblemDiff(removed=["C"], synergy={("A", "C"): 0.5}), "Synergy update.*'C' \\(removed\\)"),
+    (ProblemDiff(added={"A": (0.9, {})}), "already in problem"),
+])
+def test_apply_rejects_names_missing_from_result(diff, message):
+    with pytest.raises(ValueError, match=message):
+        diff.apply(_problem())
+
+
+def test_removed_drug_can_be_added_back():
+    diff = ProblemDiff(removed=["A"], added={"A": (0.1, {"B": 0.2})})
+    problem = diff.apply(_problem())
+
+    assert problem.drug_names == ["B", "C", "D", "A"]
+    assert _synergy(problem, "A", "B") == 0.2
+    assert _synergy(problem, "A", "D") == 0.0
+
+
+@pytest.mark.parametrize("backend", ["branch_and_bound", "greedy", "tabu_search", "eigensolver"])
+def test_resolve_matches_cold_solve(backend):
+    optimizer = QuantumDrugOptimizer(backend)
+    problem = _problem()
+    previous = optimizer.solve(problem)
+    diff = ProblemDiff(removed=["B"], added={"E": (0.35, {"A": 0.3, "C": 0.1})})
+
+    new_problem, result = optimizer.resolve(problem, previous, diff)
+
+    recovery, synergy, k = new_problem.arrays()
+    assert result.fval == pytest.approx(branch_and_bound(recovery, synergy, k).fval)
+    selected = {new_problem.drug_names[i] for i, v in enumerate(result.x) if round(v) == 1}
+    old = {problem.drug_names[i] for i, v in enumerate(previous.x) if round(v) == 1}
+
+    delta = result.stats["delta"]
+    assert delta["added"] == sorted(selected - old)
+    assert delta["removed"] == sorted(old - selected)
+    assert delta["fval_change"] == pytest.approx(result.fval - previous.fval)
+
+
+def test_resolve_without_diff_keeps_problem():
+    optimizer = QuantumDrugOptimizer("branch_and_bound")
+    problem = _problem()
+    previous = optimizer.solve(problem)
+
+    same, result = optimizer.resolve(problem, previous)
+
+    assert same is problem
+    assert result.selected == previous.selected
+    assert result.stats["delta"] == {"added": [], "removed": [], "fval_change": 0.0}
+
+
+def test_warm_start_keeps_surviving_names():
+    problem = DrugSelectionProblem(NAMES, np.array(RECOVERY), np.triu(SYNERGY, 1), 3)
+
+    topped_up = problem.warm_start(["D", "Z"])
+    assert len(topped_up) == 3 and 3 in topped_up
+    assert problem.warm_start(["A", "B", "C", "D"]) == [0, 1, 2]
+    assert len(problem.warm_start([])) == 3
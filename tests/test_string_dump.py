@@ -0,0 +1,111 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from core.biology.string_dump import StringDumpLoader
+
+LINKS = """protein1 protein2 combined_score
+9606.ENSP01 9606.ENSP02 900
+9606.ENSP02 9606.ENSP01 900
+9606.ENSP01 9606.ENSP03 500
+9606.ENSP03 9606.ENSP01 650
+9606.ENSP02 9606.ENSP04 300
+9606.ENSP04 9606.ENSP02 300
+9606.ENSP03 9606.ENSP05 800
+9606.ENSP05 9606.ENSP03 800
+"""
+
+INFO = """#string_protein_id\tpreferred_name\tprotein_size
+9606.ENSP01\tTNF\t233
+9606.ENSP02\tIFNG\t166
+9606.ENSP03\tIL6\t212
+9606.ENSP04\tSTAT1\t750
+"""
+
+
+@pytest.fixture
+def dump(tmp_path):
+    links = tmp_path / "protein.links.txt"
+    links.write_text(LINKS)
+    info = tmp_path / "protein.info.txt"
+    info.write_text(INFO)
+    return links, info
+
+
+def _edges(loader, proteins=None):
+    nodes, src, dst, weight = loader.load(proteins)
+    return {
+        tuple(sorted((nodes[a], nodes[b]))): round(float(w), 3)
+        for a, b, w in zip(src.tolist(), dst.tolist(), weight.tolist())
+    }
+
+
+def test_aliases_threshold_and_dedup(dump):
+    links, info = dump
+    loader = StringDumpLoader(str(links), str(info), score_threshold=0.4)
+
+    # Both directions collapse to one edge with the higher score;
+    # ENSP05 has no protein.info entry and keeps its STRING id
+    assert _edges(loader) == {
+        ("IFNG", "TNF"): 0.9,
+        ("IL6", "TNF"): 0.65,
+        ("9606.ENSP05", "IL6"): 0.8,
+    }
+
+
+def test_protein_subset(dump):
+    links, info = dump
+    loader = StringDumpLoader(str(links), str(info), score_threshold=0.2)
+
+    assert _edges(loader, ["TNF", "IFNG", "STAT1"]) == {
+        ("IFNG", "TNF"): 0.9,
+        ("IFNG", "STAT1"): 0.3,
+    }
+
+
+def test_gzip_matches_plain(dump, tmp_path):
+    links, info = dump
+    packed = tmp_path / "protein.links.txt.gz"
+    with gzip.open(packed, "wt") as fh:
+        fh.write(LINKS)
+
+    plain = StringDumpLoader(str(links), str(info), chunksize=3)
+    gzipped = StringDumpLoader(str(packed), str(info), chunksize=3)
+
+    assert _edges(plain) == _edges(gzipped)
+
+
+def test_cached_reload_is_memory_mapped(dump, monkeypatch):
+    links, info = dump
+    loader = StringDumpLoader(str(links), str(info))
+    first = _edges(loader)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("dump parsed again")
+
+    monkeypatch.setattr(StringDumpLoader, "_parse", fail)
+    nodes, src, dst, weight = loader.load()
+
+    assert isinstance(src, np.memmap) and isinstance(weight, np.memmap)
+    assert _edges(loader) == first
+
+
+def test_changed_dump_invalidates_cache(dump):
+    links, info = dump
+    loader = StringDumpLoader(str(links), str(info))
+    _edges(loader)
+
+    links.write_text(LINKS + "9606.ENSP04 9606.ENSP05 990\n")
+    assert _edges(loader)[("9606.ENSP05", "STAT1")] == 0.99
+
+
+def test_graph_and_network_views(dump):
+    links, info = dump
+    loader = StringDumpLoader(str(links), str(info))
+
+    graph = loader.build_graph()
+    network = loader.load_network()
+
+    assert graph.number_of_edges() == network.number_of_edges() == 3
+    assert graph["TNF"]["IFNG"]["weight"] == pytest.approx(0.9)
@@ -0,0 +1,114 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from core.biology.array_network import ArrayNetwork
+from core.biology.system_distance import (
+    IncrementalDistance,
+    batch_system_distance,
+    edge_arrays,
+    system_distance,
+    system_distance_arrays,
+)
+
+
+def _reference_distance(state_a, state_b, graph):
+    """
+    The original dict-based system_distance, kept as the oracle.
+    """
+    diffs = []
+
+    for u, v, data in graph.edges(data=True):
+        w = data["weight"]
+        da = abs(state_a[u] - state_b[u])
+        db = abs(state_a[v] - state_b[v])
+        diffs.append(w * (da + db) / 2)
+
+    return np.mean(diffs)
+
+
+def _instance(seed, n_nodes=40, n_edges=120):
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(n_nodes, n_edges, seed=seed)
+    graph = nx.relabel_nodes(graph, {i: f"P{i}" for i in graph.nodes()})
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = float(rng.uniform(0.15, 1.0))
+
+    healthy = {p: float(rng.uniform(0.5, 1.5)) for p in graph.nodes()}
+    disease = {p: healthy[p] * float(rng.uniform(0.3, 3.0)) for p in graph.nodes()}
+    return graph, healthy, disease
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_paths_match_original(seed):
+    graph, healthy, disease = _instance(seed)
+    expected = _reference_distance(healthy, disease, graph)
+
+    network = ArrayNetwork.from_networkx(graph)
+    nodes, src, dst, weight = edge_arrays(graph)
+    a = network.state_array(healthy)
+    b = network.state_array(disease)
+
+    assert system_distance(healthy, disease, graph) == expected
+    assert system_distance(healthy, disease, network) == expected
+    assert system_distance(a, b, network) == expected
+    assert system_distance_arrays(a, b, src, dst, weight) == expected
+    assert batch_system_distance(a, np.stack([b, b]), src, dst, weight).tolist() == [expected] * 2
+
+
+def test_batch_matches_per_state_loop():
+    graph, healthy, _ = _instance(3)
+    network = ArrayNetwork.from_networkx(graph)
+    rng = np.random.default_rng(0)
+    states = rng.uniform(0.2, 2.0, (7, network.number_of_nodes()))
+
+    expected = [
+        _reference_distance(healthy, network.state_dict(row), graph) for row in states
+    ]
+    got = batch_system_distance(
+        network.state_array(healthy), states, network.src, network.dst, network.weight
+    )
+    np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+
+def test_string_records_network_matches_graph():
+    records = [
+        {"preferredName_A": "TNF", "preferredName_B": "IFNG", "score": 0.9},
+        {"preferredName_A": "IFNG", "preferredName_B": "TNF", "score": 0.7},
+        {"preferredName_A": "TNF", "preferredName_B": "IL6", "score": 0.8},
+        {"preferredName_A": "IL6", "preferredName_B": "STAT3", "score": 0.95},
+    ]
+    graph = nx.Graph()
+    for r in records:
+        graph.add_edge(r["preferredName_A"], r["preferredName_B"], weight=r["score"])
+
+    network = ArrayNetwork.from_string_records(records)
+    healthy = {"TNF": 1.0, "IFNG": 1.0, "IL6": 1.0, "STAT3": 1.0}
+    disease = {"TNF": 2.0, "IFNG": 1.4, "IL6": 0.5, "STAT3": 1.1}
+
+    assert network.number_of_edges() == 3
+    assert system_distance(healthy, disease, network) == pytest.approx(
+        _reference_distance(healthy, disease, graph), abs=1e-12
+    )
+    assert _reference_distance(healthy, disease, network.to_networkx()) == pytest.approx(
+        _reference_distance(healthy, disease, graph), abs=1e-12
+    )
+
+
+def test_incremental_distance_matches_full_recompute():
+    graph, healthy, disease = _instance(4)
+    scorer = IncrementalDistance(healthy, disease, graph)
+    effects = [{"P1": 0.5, "P7": 1.3}, {"P2": 0.0}, {"P7": 0.8, "P30": 1.1}]
+
+    state = dict(disease)
+    for effect in effects:
+        scorer.push(effect)
+        for protein, factor in effect.items():
+            state[protein] *= factor
+        assert scorer.distance == pytest.approx(
+            _reference_distance(healthy, state, graph), rel=1e-12
+        )
+
+    for _ in effects:
+        scorer.pop()
+    assert scorer.distance == pytest.approx(_reference_distance(healthy, disease, graph), rel=1e-12)